@@ -1,8 +1,10 @@
 # green/a2a_app.py
 from __future__ import annotations
 
-import json
 import os
+import re
+from collections import ChainMap
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 
 from a2a.server.apps import A2AStarletteApplication
@@ -13,55 +15,41 @@ from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import AgentCard
 from a2a.utils import new_agent_text_message
 
-# IMPORTANT: import OSWorldSpec too (your schema requires region + task_config)
-from .a2a_models import ActRequest, OSWorldSpec
-from .app import _card_payload, _act_core, _choose_osworld_task
+# IMPORTANT: the schema requires osworld.region + osworld.task_config
+from .a2a_models import ActRequest, adapter
+from .app import _card_payload, _act_core_dict, _choose_osworld_task
 
 
+# Cached at import: the controller injects these before startup and they
+# never change while the process is alive.
+_AGENT_URL = os.getenv("AGENT_URL", "")
+_AWS_REGION = os.getenv("AWS_REGION")
+
 WHITE_URL_TAG_START = "<white_agent_url>"
 WHITE_URL_TAG_END = "</white_agent_url>"
 
+# One compiled linear scan instead of the find/find/slice triple.
+_WHITE_URL_RE = re.compile(r"<white_agent_url>(.*?)</white_agent_url>", re.DOTALL)
+
 # This matches what you want "default" to mean:
 # random sample 1 task from test_all, fixed seed, filter out gdrive.
-DEFAULT_ENV_CONFIG: Dict[str, Any] = {
+DEFAULT_ENV_CONFIG = MappingProxyType({
     "mode": "random",
     "slice": "test_all",
     "k": 1,
     "seed": 42,
     "nogdrive": True,
-}
+})
 
 
 def _extract_white_agent_url(instruction: str) -> Optional[str]:
     """Extract <white_agent_url>...</white_agent_url>."""
     if not instruction:
         return None
-    start = instruction.find(WHITE_URL_TAG_START)
-    if start == -1:
+    m = _WHITE_URL_RE.search(instruction)
+    if not m:
         return None
-    start += len(WHITE_URL_TAG_START)
-    end = instruction.find(WHITE_URL_TAG_END, start)
-    if end == -1:
-        return None
-    return instruction[start:end].strip() or None
-
-
-def _safe_json_response_to_dict(resp: Any) -> Dict[str, Any]:
-    """Parse fastapi JSONResponse (resp.body) or accept dict directly."""
-    if resp is None:
-        return {}
-    if isinstance(resp, dict):
-        return resp
-    if hasattr(resp, "model_dump"):  # pydantic v2
-        return resp.model_dump()
-    if hasattr(resp, "dict"):  # pydantic v1
-        return resp.dict()
-    if hasattr(resp, "body"):
-        try:
-            return json.loads(resp.body.decode("utf-8"))
-        except Exception:
-            return {}
-    return {}
+    return m.group(1).strip() or None
 
 
 class OSWorldGreenAgentExecutor(AgentExecutor):
@@ -85,13 +73,14 @@ class OSWorldGreenAgentExecutor(AgentExecutor):
             )
 
         # Pick AWS region (required by your OSWorldSpec schema)
-        region = os.getenv("AWS_REGION")
+        region = _AWS_REGION
         if not region:
             raise RuntimeError("AWS_REGION is not set, but OSWorldSpec.region is required.")
 
-        # Build env_cfg for random selection; also include white url so _act_core can use it if needed
-        env_cfg = dict(DEFAULT_ENV_CONFIG)
-        env_cfg["white_agent_url"] = white_agent_url
+        # Build env_cfg for random selection; also include white url so _act_core
+        # can use it if needed. ChainMap layers the per-request override on the
+        # shared read-only defaults without copying them.
+        env_cfg = ChainMap({"white_agent_url": white_agent_url}, DEFAULT_ENV_CONFIG)
 
         # Choose ONE concrete OSWorld task_config dict
         chosen_task_id, task_config = _choose_osworld_task(env_cfg)
@@ -99,23 +88,22 @@ class OSWorldGreenAgentExecutor(AgentExecutor):
         # Use the assessment/task id from A2A context if available, else use chosen task id
         assess_id = getattr(context, "task_id", None) or chosen_task_id
 
-        osworld = OSWorldSpec(
-            region=region,
-            task_config=task_config,
-            # screen_width/height have defaults in OSWorldSpec, no need to set
-            # provider_name/os_type also have defaults
+        # Validate through the cached TypeAdapter instead of per-call model
+        # construction (screen/provider/limits keep their schema defaults).
+        act_req = adapter(ActRequest).validate_python(
+            {
+                "task_id": str(assess_id),
+                "instruction": instruction,
+                "osworld": {
+                    "region": region,
+                    "task_config": task_config,
+                },
+            }
         )
 
-        act_req = ActRequest(
-            task_id=str(assess_id),
-            instruction=instruction,
-            osworld=osworld,
-            # limits has default, seed optional
-        )
-
-        # Run your original evaluation core
-        resp = await _act_core(act_req)
-        payload = _safe_json_response_to_dict(resp)
+        # Run the evaluation core; it hands back the result dict directly,
+        # so there is no JSONResponse body to decode and re-parse.
+        payload = await _act_core_dict(act_req)
 
         success = bool(payload.get("success", False))
         reward = float(payload.get("reward", 0.0) or 0.0)
@@ -153,21 +141,23 @@ def _build_agent_card() -> AgentCard:
     card_dict = {k: v for k, v in raw.items() if k in allowed_keys}
 
     # Ensure url exists: prefer AGENT_URL (injected by controller)
-    if not card_dict.get("url"):
-        agent_url = os.getenv("AGENT_URL")
-        if agent_url:
-            card_dict["url"] = agent_url
+    if not card_dict.get("url") and _AGENT_URL:
+        card_dict["url"] = _AGENT_URL
 
     return AgentCard(**card_dict)
 
 
+# Build the pydantic AgentCard once; every A2A handshake reuses it.
+_AGENT_CARD = _build_agent_card()
+
+
 _request_handler = DefaultRequestHandler(
     agent_executor=OSWorldGreenAgentExecutor(),
     task_store=InMemoryTaskStore(),
 )
 
 _a2a_app = A2AStarletteApplication(
-    agent_card=_build_agent_card(),
+    agent_card=_AGENT_CARD,
     http_handler=_request_handler,
 )
 
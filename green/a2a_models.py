@@ -1,6 +1,13 @@
 # green/a2a_models.py
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def adapter(model: type) -> TypeAdapter:
+    """Cached TypeAdapter; building one per validation call is expensive."""
+    return TypeAdapter(model)
 
 class CardResponse(BaseModel):
     name: str = "OSWorld-Green"
@@ -26,7 +33,7 @@ class ActRequest(BaseModel):
     task_id: str
     instruction: str
     seed: Optional[int] = None
-    limits: ActLimits = ActLimits()
+    limits: ActLimits = Field(default_factory=ActLimits)
     osworld: OSWorldSpec
 
 class Observation(BaseModel):
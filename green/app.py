@@ -1,17 +1,23 @@
-import asyncio, os, time, uuid, re, json, random
-from datetime import datetime, timezone
+import asyncio, hmac, os, sys, time, uuid, re, random
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from hashlib import sha256
-from typing import Any, Dict, Tuple, Optional
+from typing import Any, Dict, Mapping, Tuple, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Header, Request
-from fastapi.responses import JSONResponse
+
+try:
+    import aiofiles
+except Exception:  # pragma: no cover - optional dependency
+    aiofiles = None
+from fastapi import Depends, FastAPI, HTTPException, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .a2a_models import CardResponse, ActRequest, ActResult, Observation
+from .orjson_response import ORJSONResponse
+from .serialization import json_dumps, json_loads
 from .validators import ensure_python_backend_only
-from .osworld_adapter import OSWorldAdapter
 from .white_client import WhiteAgentClient
 from .result_writer import ResultWriter
 
@@ -25,41 +31,97 @@ WHITE_AGENT_URL = os.getenv(
 )
 OSWORLD_CLIENT_PASSWORD = os.getenv("OSWORLD_CLIENT_PASSWORD", "osworld-public-evaluation")
 
+# Env vars do not change post-startup; read them once instead of per request.
+AWS_REGION = os.getenv("AWS_REGION", "<unset>")
+
+# Interpreter version is fixed for the process; format it once.
+_PY_VER = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
+
 # Auth switches
 GREEN_AUTH_TOKEN = (os.getenv("GREEN_AUTH_TOKEN") or "").strip()
+GREEN_AUTH_TOKEN_BYTES = GREEN_AUTH_TOKEN.encode("utf-8")
 REQUIRE_AUTH = os.getenv("GREEN_REQUIRE_AUTH", "true").lower() != "false"
 
 # Run artifacts base
 RUN_BASE = Path(os.getenv("GREEN_RUN_DIR") or (ROOT / "results" / "green_runs")).expanduser()
 RUN_BASE.mkdir(parents=True, exist_ok=True)
+_RUN_BASE_STR = str(RUN_BASE)
+
+# 'latest' symlink upkeep is a debugging convenience: two extra syscalls
+# per run that race under concurrent /act. Off unless explicitly enabled
+# (scripts/green_smoke.sh maintains its own link from logs_dir anyway).
+_UPDATE_LATEST = os.getenv("GREEN_UPDATE_LATEST", "false").lower() == "true"
 
 # ---------------- utils ----------------
+_SAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
 def _safe_name(s: str) -> str:
     """Return a filesystem-safe short name."""
-    s = re.sub(r"[^A-Za-z0-9_.-]+", "-", (s or "").strip())
+    s = _SAFE_NAME_RE.sub("-", (s or "").strip())
     return s[:120] if len(s) > 120 else s
 
 
 def _make_run_dir(task_id: str) -> Path:
     """Create a unique run dir and refresh 'latest' symlink."""
-    ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    run_dir = RUN_BASE / f"{_safe_name(task_id)}-{ts}"
-    (run_dir / "frames").mkdir(parents=True, exist_ok=True)
-    latest = RUN_BASE / "latest"
-    try:
-        if latest.exists() or latest.is_symlink():
-            latest.unlink()
-        latest.symlink_to(run_dir, target_is_directory=True)
-    except Exception:
-        # Symlink failure should not kill the run.
-        pass
-    return run_dir
+    ts = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+    # Plain os.path string ops here; pathlib object churn adds up per /act.
+    run_dir_str = os.path.join(_RUN_BASE_STR, f"{_safe_name(task_id)}-{ts}")
+    os.makedirs(os.path.join(run_dir_str, "frames"), exist_ok=True)
+    if _UPDATE_LATEST:
+        latest = os.path.join(_RUN_BASE_STR, "latest")
+        try:
+            if os.path.lexists(latest):
+                os.unlink(latest)
+            os.symlink(run_dir_str, latest, target_is_directory=True)
+        except Exception:
+            # Symlink failure should not kill the run.
+            pass
+    # Callers work with Path; convert once at the boundary.
+    return Path(run_dir_str)
+
+
+# Dedicated pool for blocking OSWorld/env and writer calls. Starlette's
+# default executor is shared with request parsing and other framework
+# work; long env.reset/env.step calls would otherwise starve it.
+_OSWORLD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GREEN_OSWORLD_THREADS", "16")),
+    thread_name_prefix="osworld",
+)
 
 
 async def run_in_thread(func, *args, **kwargs):
-    """Run a blocking function in a background thread."""
+    """Run a blocking function on the dedicated OSWorld thread pool."""
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
+    return await loop.run_in_executor(_OSWORLD_EXECUTOR, lambda: func(*args, **kwargs))
+
+
+# Max records coalesced into one executor hop by the writer drain task.
+_WRITER_BATCH_SIZE = 16
+
+
+async def _drain_writer(queue: "asyncio.Queue", writer: ResultWriter) -> None:
+    """
+    Background task that drains frame/step records queued by _act_core and
+    writes them in batches, so per-step PNG and JSONL writes stop blocking
+    the episode loop one syscall at a time. A `None` sentinel flushes the
+    remaining records and ends the task.
+    """
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        batch = [item]
+        while len(batch) < _WRITER_BATCH_SIZE:
+            try:
+                nxt = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if nxt is None:
+                await run_in_thread(writer.write_batch, batch)
+                return
+            batch.append(nxt)
+        await run_in_thread(writer.write_batch, batch)
 
 
 def _classify_failure(exc: Exception) -> str:
@@ -85,16 +147,22 @@ def _pick_token_from_headers(x_auth_token: Optional[str], authorization: Optiona
 
 
 def _enforce_auth(header_token: Optional[str] = None, path_token: Optional[str] = None) -> None:
-    """Enforce auth unless disabled by GREEN_REQUIRE_AUTH=false."""
-    if not REQUIRE_AUTH:
-        return
+    """Enforce auth; rebound to a no-op below when GREEN_REQUIRE_AUTH=false."""
     if not GREEN_AUTH_TOKEN:
         raise HTTPException(status_code=401, detail="auth-required-but-token-missing")
     supplied = (header_token or path_token or "").strip()
-    if supplied != GREEN_AUTH_TOKEN:
+    # Constant-time comparison; plain != short-circuits and leaks timing.
+    if not hmac.compare_digest(supplied.encode("utf-8"), GREEN_AUTH_TOKEN_BYTES):
         raise HTTPException(status_code=401, detail="unauthorized")
 
 
+if not REQUIRE_AUTH:
+    # Auth is off for the whole process lifetime (dev mode); swap in a
+    # no-op so every endpoint skips the per-call branching entirely.
+    def _enforce_auth(header_token: Optional[str] = None, path_token: Optional[str] = None) -> None:  # noqa: F811
+        return
+
+
 # ---------------- card & signature helpers ----------------
 def _get_agent_url() -> str:
     """
@@ -112,19 +180,23 @@ def _get_agent_url() -> str:
     return os.getenv("AGENT_URL", "")
 
 
-def _agent_version() -> str:
-    try:
-        return CardResponse().version
-    except Exception:
-        return "0.1.0"
+# Computed once at import: instantiating CardResponse just to read its
+# version default runs pydantic validation for no benefit per call.
+try:
+    _AGENT_VERSION = CardResponse().version
+except Exception:
+    _AGENT_VERSION = "0.1.0"
 
 
-def _card_payload() -> Dict[str, Any]:
+@lru_cache(maxsize=1)
+def _card_payload_cached() -> Dict[str, Any]:
     """
-    Return the MCP-style agent card that AgentBeats v2 expects.
+    Build the MCP-style agent card that AgentBeats v2 expects.
 
     This follows the MCP Agent Card schema (protocolVersion 0.3.0)
     and describes this service as an OSWorld Green assessment host.
+    The card is pure (AGENT_URL does not change post-startup), so it
+    is built once and cached for the process lifetime.
     """
     return {
         "capabilities": {
@@ -177,42 +249,74 @@ def _card_payload() -> Dict[str, Any]:
             }
         ],
         "url": _get_agent_url(),
-        "version": _agent_version(),
+        "version": _AGENT_VERSION,
     }
 
 
+def _card_payload() -> Dict[str, Any]:
+    """Cached agent card; shallow copy so callers may tweak top-level keys."""
+    return dict(_card_payload_cached())
+
+
+@lru_cache(maxsize=1)
+def _card_bytes() -> bytes:
+    """The card serialized once; card endpoints reduce to a memcpy."""
+    return json_dumps(_card_payload_cached())
+
+
+def _card_response() -> Response:
+    return Response(content=_card_bytes(), media_type="application/json")
+
+
+# /reset is a fixed acknowledgement; serialize it once.
+_RESET_BYTES = json_dumps({"reset": "ok"})
+
+
+def _reset_response() -> Response:
+    return Response(content=_RESET_BYTES, media_type="application/json")
+
+
 def _iso_utc(ts: float) -> str:
-    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # time.gmtime/strftime skip datetime object construction entirely
+    # (same formatting path result_writer uses).
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
 
 
+@lru_cache(maxsize=32)
 def _make_env_signature(backend_mode: str, region: str, screen_w: int, screen_h: int) -> str:
     """
     Deterministic environment signature so the platform can deduplicate / bucket results.
     Components: backend_mode, region, screen, python_version, agent_version.
+
+    Inputs come from a small static set, so the JSON dump + SHA-256 runs
+    once per distinct combination instead of twice per /act call.
     """
     items = {
         "backend": backend_mode,
         "region": region or "<unset>",
         "screen": f"{screen_w}x{screen_h}",
-        "python": f"{os.sys.version_info.major}.{os.sys.version_info.minor}.{os.sys.version_info.micro}",
-        "agent_version": _agent_version(),
+        "python": _PY_VER,
+        "agent_version": _AGENT_VERSION,
     }
-    blob = json.dumps(items, sort_keys=True, separators=(",", ":"))
-    return sha256(blob.encode("utf-8")).hexdigest()
+    return sha256(json_dumps(items, sort_keys=True)).hexdigest()
 
 
-def _write_artifact_json(
+async def _write_artifact_json(
     run_dir: Path,
     task_id: str,
     started_at: float,
     finished_at: float,
+    frames: list,
 ) -> str:
     """
     Write artifact.json listing the core artifacts for this run, and
     return its file path as a string.
+
+    Callers pass the incrementally tracked frame list (ResultWriter
+    keeps it), so no directory scan happens here. The write goes
+    through aiofiles when available so it never blocks the event loop;
+    otherwise it falls back to the executor thread.
     """
-    frames_dir = run_dir / "frames"
-    frames = sorted([str(p) for p in frames_dir.glob("*.png")])
     artifact = {
         "task_id": task_id,
         "run_dir": str(run_dir),
@@ -223,17 +327,29 @@ def _write_artifact_json(
         "finished_at": _iso_utc(finished_at),
     }
     out = run_dir / "artifact.json"
-    with open(out, "w", encoding="utf-8") as f:
-        json.dump(artifact, f, ensure_ascii=False, indent=2)
+    payload = json_dumps(artifact, indent=True)
+    if aiofiles is not None:
+        async with aiofiles.open(out, "wb") as f:
+            await f.write(payload)
+    else:
+        await run_in_thread(out.write_bytes, payload)
     return str(out)
 
 
 # -------- env_config & white_agent_url parsing --------
+# Compiled once at import; re.search with an inline pattern pays a cache
+# lookup per call. The previous raw-string patterns double-escaped `\s`,
+# so tags with leading/trailing whitespace around the payload never
+# matched — these are the intended single-escape forms.
+_WHITE_URL_RE = re.compile(r"<white_agent_url>\s*(.*?)\s*</white_agent_url>", re.DOTALL)
+_ENV_CFG_RE = re.compile(r"<env_config>\s*(\{.*?\})\s*</env_config>", re.DOTALL)
+
+
 def _parse_white_url_from_instruction(instruction: Optional[str]) -> Optional[str]:
     """Extract <white_agent_url>...</white_agent_url> from the instruction, if present."""
     if not instruction:
         return None
-    m = re.search(r"<white_agent_url>\\s*(.*?)\\s*</white_agent_url>", instruction, re.DOTALL)
+    m = _WHITE_URL_RE.search(instruction)
     if not m:
         return None
     url = m.group(1).strip()
@@ -247,61 +363,32 @@ def _parse_env_config_from_instruction(instruction: Optional[str]) -> Dict[str,
     """
     if not instruction:
         return {}
-    m = re.search(r"<env_config>\\s*(\\{.*?\\})\\s*</env_config>", instruction, re.DOTALL)
+    m = _ENV_CFG_RE.search(instruction)
     if not m:
         return {}
     raw = m.group(1)
     try:
-        return json.loads(raw)
+        return json_loads(raw)
     except Exception as e:
         print(f"[warn] Failed to parse <env_config>: {e}")
         return {}
 
 
-def _choose_osworld_task(env_cfg: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+@lru_cache(maxsize=16)
+def _load_candidates(meta_path: str, nogdrive: bool) -> Tuple[Tuple[str, str], ...]:
     """
-    Map env_config into a single OSWorld task_config.
-
-    Supports:
-      1) direct:
-         - env_cfg["task_config"] is a dict
-
-      2) random:
-         - mode="random"
-         - slice="test_all"/"test_small"/...
-         - reads OSWorld meta JSON from third_party/osworld/evaluation_examples/<slice>.json
-
-    OSWorld meta file format is typically:
-      - dict: { "<domain>": ["<example_id>", ...], ... }
+    Read + flatten an OSWorld meta JSON into (domain, example_id) pairs,
+    with the optional gdrive filter applied. Pure function of its
+    arguments, so the parse and filter run once per (meta file, flag)
+    combination instead of on every random-mode /act.
     """
-    # ---- direct task_config ----
-    direct_cfg = env_cfg.get("task_config")
-    if isinstance(direct_cfg, dict):
-        tid = env_cfg.get("task_id") or direct_cfg.get("task_id") or "osworld_task"
-        return str(tid), direct_cfg
-
-    mode = env_cfg.get("mode", "single")
-    if mode != "random":
-        raise RuntimeError(
-            "env_config must contain either a 'task_config' dict or mode='random'. "
-            f"Got mode={mode!r}"
-        )
+    path = Path(meta_path)
+    if not path.is_file():
+        raise RuntimeError(f"OSWorld meta file not found: {path}")
 
-    EVAL_ROOT = ROOT / "third_party" / "osworld" / "evaluation_examples"
+    meta = json_loads(path.read_bytes())
 
-    slice_name = env_cfg.get("slice", "test_all")
-    meta_path = env_cfg.get("meta_path") or (EVAL_ROOT / f"{slice_name}.json")
-    meta_path = Path(meta_path)
-
-    if not meta_path.is_file():
-        raise RuntimeError(f"OSWorld meta file not found: {meta_path}")
-
-    with meta_path.open("r", encoding="utf-8") as f:
-        meta = json.load(f)
-
-    # ---- build candidates from meta ----
     candidates: list[tuple[str, str]] = []
-
     if isinstance(meta, dict):
         # OSWorld standard format: domain -> [ids]
         for domain, ids in meta.items():
@@ -321,13 +408,11 @@ def _choose_osworld_task(env_cfg: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
             if isinstance(domain, str) and isinstance(ex_id, str):
                 candidates.append((domain.strip(), ex_id.strip()))
     else:
-        raise RuntimeError(f"Invalid meta json format (expect dict or list): {meta_path}")
+        raise RuntimeError(f"Invalid meta json format (expect dict or list): {path}")
 
     if not candidates:
-        raise RuntimeError(f"Invalid or empty meta file: {meta_path}")
+        raise RuntimeError(f"Invalid or empty meta file: {path}")
 
-    # ---- optional nogdrive filter (best-effort) ----
-    nogdrive = bool(env_cfg.get("nogdrive"))
     if nogdrive:
         # OSWorld examples are not always "gdrive"; keep this lightweight.
         filtered = []
@@ -339,6 +424,46 @@ def _choose_osworld_task(env_cfg: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         if filtered:
             candidates = filtered
 
+    return tuple(candidates)
+
+
+def _choose_osworld_task(env_cfg: Mapping[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Map env_config into a single OSWorld task_config.
+
+    Supports:
+      1) direct:
+         - env_cfg["task_config"] is a dict
+
+      2) random:
+         - mode="random"
+         - slice="test_all"/"test_small"/...
+         - reads OSWorld meta JSON from third_party/osworld/evaluation_examples/<slice>.json
+
+    OSWorld meta file format is typically:
+      - dict: { "<domain>": ["<example_id>", ...], ... }
+    """
+    # ---- direct task_config ----
+    direct_cfg = env_cfg.get("task_config")
+    if isinstance(direct_cfg, dict):
+        tid = env_cfg.get("task_id") or direct_cfg.get("task_id") or "osworld_task"
+        return str(tid), direct_cfg
+
+    mode = env_cfg.get("mode", "single")
+    if mode != "random":
+        raise RuntimeError(
+            "env_config must contain either a 'task_config' dict or mode='random'. "
+            f"Got mode={mode!r}"
+        )
+
+    EVAL_ROOT = ROOT / "third_party" / "osworld" / "evaluation_examples"
+
+    slice_name = env_cfg.get("slice", "test_all")
+    meta_path = env_cfg.get("meta_path") or (EVAL_ROOT / f"{slice_name}.json")
+
+    # ---- candidates (cached flatten + nogdrive filter) ----
+    candidates = _load_candidates(str(meta_path), bool(env_cfg.get("nogdrive")))
+
     # ---- sample one ----
     seed = env_cfg.get("seed")
     rng = random.Random(seed)
@@ -349,8 +474,7 @@ def _choose_osworld_task(env_cfg: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
     if not cfg_path.is_file():
         raise RuntimeError(f"Task config JSON not found: {cfg_path}")
 
-    with cfg_path.open("r", encoding="utf-8") as f:
-        task_cfg = json.load(f)
+    task_cfg = json_loads(cfg_path.read_bytes())
 
     # task id for logging
     task_id = env_cfg.get("task_id") or task_cfg.get("task_id") or f"{domain}__{ex_id}"
@@ -359,7 +483,11 @@ def _choose_osworld_task(env_cfg: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
 
 
 # ---------------- FastAPI app ----------------
-app = FastAPI(title="OSWorld Green Agent", version="0.1.0")
+app = FastAPI(
+    title="OSWorld Green Agent",
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+)
 
 # CORS for browser-origin GET/POST (AgentBeats web)
 app.add_middleware(
@@ -370,6 +498,70 @@ app.add_middleware(
 )
 
 
+# Warm OSWorld adapters keyed by construction params (provider, os_type,
+# region, screen). DesktopEnv.reset(task_config) re-tasks an existing VM
+# (OSWorld's own runners reuse one env across examples), so keeping a
+# healthy adapter between /act calls skips the many-second bring-up.
+# Envs that finished on the failure path are closed, never pooled.
+_ENV_POOL: Dict[tuple, list] = {}
+_ENV_POOL_LOCK = asyncio.Lock()
+_ENV_POOL_MAX = int(os.getenv("GREEN_ENV_POOL_SIZE", "1"))
+
+
+async def _acquire_env(key: tuple):
+    """Pop a warm adapter for `key`, or None if the pool is empty."""
+    async with _ENV_POOL_LOCK:
+        pool = _ENV_POOL.get(key)
+        if pool:
+            return pool.pop()
+    return None
+
+
+async def _release_env(key: tuple, env) -> bool:
+    """Return an adapter to the pool; False means the caller must close it."""
+    if _ENV_POOL_MAX <= 0:
+        return False
+    async with _ENV_POOL_LOCK:
+        pool = _ENV_POOL.setdefault(key, [])
+        if len(pool) < _ENV_POOL_MAX:
+            pool.append(env)
+            return True
+    return False
+
+
+# One pooled client per white agent URL, shared across /act requests so
+# the per-step HTTP round-trips reuse keep-alive connections.
+_white_clients: Dict[str, WhiteAgentClient] = {}
+
+
+def _get_white_client(base_url: str) -> WhiteAgentClient:
+    client = _white_clients.get(base_url)
+    if client is None:
+        client = _white_clients[base_url] = WhiteAgentClient(base_url)
+    return client
+
+
+@app.on_event("shutdown")
+async def _close_white_clients() -> None:
+    for client in _white_clients.values():
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+    _white_clients.clear()
+
+
+@app.on_event("shutdown")
+async def _close_pooled_envs() -> None:
+    for pool in _ENV_POOL.values():
+        for env in pool:
+            try:
+                await run_in_thread(env.close)
+            except Exception:
+                pass
+    _ENV_POOL.clear()
+
+
 @app.get("/health")
 async def health():
     ok, mode = ensure_python_backend_only()
@@ -377,14 +569,14 @@ async def health():
     return {
         "ok": ok,
         "backend": mode,
-        "region": os.getenv("AWS_REGION", "<unset>"),
+        "region": AWS_REGION,
         "white_url": WHITE_AGENT_URL,
         "auth": auth_mode,
     }
 
 
 # ---------- shared /act core ----------
-async def _act_core(req: ActRequest) -> JSONResponse:
+async def _act_core_dict(req: ActRequest) -> Dict[str, Any]:
     # Backend guard (must be python API, not HTTP controller)
     ok, mode = ensure_python_backend_only()
     if not ok:
@@ -426,62 +618,118 @@ async def _act_core(req: ActRequest) -> JSONResponse:
     run_dir = _make_run_dir(assess_id)
     writer = ResultWriter(run_dir)
 
-    # Basic geometry (used for env + metadata)
-    screen_w = getattr(osworld_cfg, "screen_width", 1920) if osworld_cfg is not None else 1920
-    screen_h = getattr(osworld_cfg, "screen_height", 1080) if osworld_cfg is not None else 1080
+    # Unpack the optional osworld fields once; they feed the header, env
+    # bring-up, pool key, and both result paths.
+    if osworld_cfg is not None:
+        provider_name = getattr(osworld_cfg, "provider_name", None)
+        os_type = getattr(osworld_cfg, "os_type", None)
+        region_cfg = getattr(osworld_cfg, "region", None)
+        screen_w = getattr(osworld_cfg, "screen_width", 1920)
+        screen_h = getattr(osworld_cfg, "screen_height", 1080)
+    else:
+        provider_name = os_type = region_cfg = None
+        screen_w, screen_h = 1920, 1080
 
     header = {
         "task_id": assess_id,
-        "region": os.getenv("AWS_REGION", "<unset>"),
+        "region": AWS_REGION,
         "white_agent": white_url,
-        "provider": getattr(osworld_cfg, "provider_name", None) if osworld_cfg is not None else None,
+        "provider": provider_name,
         "screen": [screen_w, screen_h],
         "env_config": env_cfg,
     }
     writer.write_summary({"start": header})
 
-    white = WhiteAgentClient(white_url)
+    # Frame/step records are queued and written in batches off the loop.
+    write_queue: "asyncio.Queue" = asyncio.Queue()
+    drain_task: Optional[asyncio.Task] = asyncio.create_task(
+        _drain_writer(write_queue, writer)
+    )
+
+    async def _flush_writes() -> None:
+        # Flush queued records before reading artifacts; idempotent.
+        nonlocal drain_task
+        if drain_task is not None:
+            write_queue.put_nowait(None)
+            task, drain_task = drain_task, None
+            await task
+
     env = None
     steps = 0
-    t0 = time.time()
+    # Monotonic clock drives the step budget (immune to wall-clock jumps
+    # and cheaper per read); wall time is kept only for the artifact index.
+    started_wall = time.time()
+    t0 = time.monotonic()
     reward_final = 0.0
     done = False
+    # Only cleanly finished episodes may return their env to the pool.
+    episode_ok = False
+    env_key = (provider_name, os_type, region_cfg, screen_w, screen_h)
 
-    region = os.getenv("AWS_REGION", "<unset>")
-    agent_ver = _agent_version()
-    env_sig = _make_env_signature(mode, region, screen_w, screen_h)
+    env_sig = _make_env_signature(mode, AWS_REGION, screen_w, screen_h)
     seed_val = getattr(req, "seed", None)
+    limits = getattr(req, "limits", None)
+    # Dumped once; reused by both the success and failure details dicts.
+    limits_dump = limits.model_dump() if limits is not None else None
 
-    try:
+    async def _white_reset_quiet() -> None:
         # Optional white reset (best-effort)
         try:
             await white.reset()
         except Exception:
             pass
 
-        # Bring up OSWorld
-        env = OSWorldAdapter(
-            provider_name=getattr(osworld_cfg, "provider_name", None) if osworld_cfg is not None else None,
-            os_type=getattr(osworld_cfg, "os_type", None) if osworld_cfg is not None else None,
-            region=getattr(osworld_cfg, "region", None) if osworld_cfg is not None else None,
+    def _bring_up_env():
+        # Imported lazily: OSWorldAdapter pulls in the whole desktop_env
+        # provider graph, which would otherwise slow every worker cold start
+        # even for card/health-only traffic. Construct in the executor too:
+        # DesktopEnv() already does heavy provider work before reset().
+        # Note: envs are deliberately NOT deduped/shared across concurrent
+        # /act calls with identical task_configs — each episode mutates its
+        # VM, so every request needs its own DesktopEnv instance.
+        from .osworld_adapter import OSWorldAdapter
+
+        return OSWorldAdapter(
+            provider_name=provider_name,
+            os_type=os_type,
+            region=region_cfg,
             screen_size=(screen_w, screen_h),
             client_password=OSWORLD_CLIENT_PASSWORD,
         )
 
+    try:
+        # Resolved inside the try: the URL is instruction-supplied, and
+        # a malformed one (httpx.InvalidURL at client construction) must
+        # yield a structured failure result and run the finally cleanup
+        # (drain the writer task, close trace.jsonl), not a bare 500.
+        white = _get_white_client(white_url)
+
+        # Pipeline the two independent bring-up stages: the white agent
+        # reset (network RTT) runs while OSWorld boots in the executor.
+        white_reset_task = asyncio.create_task(_white_reset_quiet())
+        env = await _acquire_env(env_key)
+        if env is None:
+            env = await run_in_thread(_bring_up_env)
+
         # Reset in background thread
         obs = await run_in_thread(env.reset, task_config)
-        writer.save_frame(steps, obs.get("screenshot_b64"))
+        await white_reset_task
+        write_queue.put_nowait(
+            ("frame", steps, obs.get("screenshot_b64"), obs.get("screenshot_png"))
+        )
 
         # Limits for this run
-        limits = getattr(req, "limits", None)
         max_steps = getattr(limits, "max_steps", 50) if limits is not None else 50
         max_seconds = getattr(limits, "max_seconds", 300.0) if limits is not None else 300.0
 
         # Main loop
-        while steps < max_steps and (time.time() - t0) < max_seconds and not done:
+        while steps < max_steps and (time.monotonic() - t0) < max_seconds and not done:
             steps += 1
 
-            observation = Observation(
+            # model_construct skips validation: `obs` comes from our own
+            # env.reset/env.step, and validating a base64 screenshot
+            # string every step is pure overhead.
+            observation = Observation.model_construct(
                 screenshot_b64=obs.get("screenshot_b64"),
                 a11y_tree=obs.get("a11y_tree"),
                 width=obs.get("width"),
@@ -512,22 +760,34 @@ async def _act_core(req: ActRequest) -> JSONResponse:
             else:
                 obs, reward, done, info = await run_in_thread(env.wait, 0.5)
 
-            writer.save_frame(steps, obs.get("screenshot_b64"))
-            writer.log_step(
-                steps,
-                action={
-                    "type": action.type,
-                    "name": action.name,
-                    "pause": action.pause,
-                    "code": (action.code[:160] if action.code else None),
-                },
-                result={"reward": reward, "done": done},
+            write_queue.put_nowait(
+                ("frame", steps, obs.get("screenshot_b64"), obs.get("screenshot_png"))
+            )
+            # Encode the step record here (orjson, one pass) so the drain
+            # task appends raw bytes instead of re-serializing per step.
+            write_queue.put_nowait(
+                (
+                    "raw",
+                    json_dumps(
+                        {
+                            "t": steps,
+                            "action": {
+                                "type": action.type,
+                                "name": action.name,
+                                "pause": action.pause,
+                                "code": (action.code[:160] if action.code else None),
+                            },
+                            "result": {"reward": reward, "done": done},
+                            "timestamp": time.time(),
+                        }
+                    ),
+                )
             )
 
             if done:
                 reward_final = reward
 
-        wall = time.time() - t0
+        wall = time.monotonic() - t0
 
         # Build ActResult
         result = ActResult(
@@ -538,29 +798,33 @@ async def _act_core(req: ActRequest) -> JSONResponse:
             wall_time_sec=wall,
             logs_dir=str(run_dir),
             details={
-                "limits": limits.model_dump() if limits is not None else None,
-                "provider": getattr(osworld_cfg, "provider_name", None) if osworld_cfg is not None else None,
+                "limits": limits_dump,
+                "provider": provider_name,
                 "backend": "python-api",
                 "seed": seed_val,
-                "agent_version": agent_ver,
+                "agent_version": _AGENT_VERSION,
                 "env_signature": env_sig,
                 "env_config": env_cfg,
             },
         )
-        writer.write_result(result.model_dump())
-
-        artifact_path = _write_artifact_json(run_dir, assess_id, t0, time.time())
+        await _flush_writes()
+        artifact_path = await _write_artifact_json(
+            run_dir, assess_id, started_wall, time.time(), frames=writer.frame_paths()
+        )
         result.details["artifact_index"] = artifact_path
 
-        writer.write_summary({"start": header, "end": result.model_dump()})
-        return JSONResponse(content=result.model_dump())
+        # One pydantic walk; the same dict backs result.json, summary.json,
+        # and the response payload.
+        result_dict = result.model_dump()
+        writer.write_result(result_dict)
+        writer.write_summary({"start": header, "end": result_dict})
+        episode_ok = True
+        return result_dict
 
     except Exception as e:
-        wall = max(0.0, time.time() - t0)
+        wall = max(0.0, time.monotonic() - t0)
         failure_type = _classify_failure(e)
 
-        limits = getattr(req, "limits", None)
-
         result = ActResult(
             task_id=assess_id,
             success=False,
@@ -569,82 +833,83 @@ async def _act_core(req: ActRequest) -> JSONResponse:
             wall_time_sec=wall,
             logs_dir=str(run_dir),
             details={
-                "limits": limits.model_dump() if limits is not None else None,
-                "provider": getattr(osworld_cfg, "provider_name", None) if osworld_cfg is not None else None,
+                "limits": limits_dump,
+                "provider": provider_name,
                 "backend": "python-api",
                 "failure_type": failure_type,
                 "message": str(e),
                 "seed": seed_val,
-                "agent_version": _agent_version(),
-                "env_signature": _make_env_signature(
-                    mode, os.getenv("AWS_REGION", "<unset>"), screen_w, screen_h
-                ),
+                "agent_version": _AGENT_VERSION,
+                "env_signature": env_sig,
                 "env_config": env_cfg,
             },
         )
-        writer.write_result(result.model_dump())
-
-        artifact_path = _write_artifact_json(run_dir, assess_id, t0, time.time())
+        await _flush_writes()
+        artifact_path = await _write_artifact_json(
+            run_dir, assess_id, started_wall, time.time(), frames=writer.frame_paths()
+        )
         result.details["artifact_index"] = artifact_path
 
-        writer.write_summary({"start": header, "end": result.model_dump()})
-        return JSONResponse(content=result.model_dump())
+        result_dict = result.model_dump()
+        writer.write_result(result_dict)
+        writer.write_summary({"start": header, "end": result_dict})
+        return result_dict
 
     finally:
+        try:
+            await _flush_writes()
+        except Exception:
+            pass
         try:
             if env is not None:
-                await run_in_thread(env.close)
+                if not (episode_ok and await _release_env(env_key, env)):
+                    await run_in_thread(env.close)
         except Exception:
             pass
         writer.close()
 
 
 # ---------- header-auth endpoints (keep existing URLs) ----------
-@app.get("/card")
-async def card(
+def _auth_dep(
     x_auth_token: Optional[str] = Header(default=None),
     authorization: Optional[str] = Header(default=None),
-):
+) -> None:
+    """Shared header-auth dependency: extract, pick, and enforce in one hop."""
     _enforce_auth(_pick_token_from_headers(x_auth_token, authorization), None)
-    return JSONResponse(content=_card_payload())
+
+
+@app.get("/card")
+async def card(_: None = Depends(_auth_dep)):
+    return _card_response()
 
 
 @app.post("/reset")
-async def reset(
-    x_auth_token: Optional[str] = Header(default=None),
-    authorization: Optional[str] = Header(default=None),
-):
-    _enforce_auth(_pick_token_from_headers(x_auth_token, authorization), None)
-    return {"reset": "ok"}
+async def reset(_: None = Depends(_auth_dep)):
+    return _reset_response()
 
 
 @app.post("/act")
-async def act(
-    req: ActRequest,
-    x_auth_token: Optional[str] = Header(default=None),
-    authorization: Optional[str] = Header(default=None),
-):
-    _enforce_auth(_pick_token_from_headers(x_auth_token, authorization), None)
-    return await _act_core(req)
+async def act(req: ActRequest, _: None = Depends(_auth_dep)):
+    return ORJSONResponse(content=await _act_core_dict(req))
 
 
 # ---------- path-token endpoints: /t/{token}/... ----------
 @app.get("/t/{token}/card")
 async def card_t(token: str):
     _enforce_auth(None, token)
-    return JSONResponse(content=_card_payload())
+    return _card_response()
 
 
 @app.post("/t/{token}/reset")
 async def reset_t(token: str):
     _enforce_auth(None, token)
-    return {"reset": "ok"}
+    return _reset_response()
 
 
 @app.post("/t/{token}/act")
 async def act_t(token: str, req: ActRequest):
     _enforce_auth(None, token)
-    return await _act_core(req)
+    return ORJSONResponse(content=await _act_core_dict(req))
 
 @app.post("/", include_in_schema=False)
 async def a2a_jsonrpc_root(
@@ -674,17 +939,14 @@ async def a2a_jsonrpc_root(
 
     # ---- 1. card ----
     if method == "card":
-        # Reuse the internal agent card payload construction logic
-        result_obj = _card_payload()
+        # Embed the cached card directly; the JSON-RPC envelope only reads
+        # it during serialization, so no defensive copy is needed.
+        result_obj = _card_payload_cached()
 
     # ---- 2. reset ----
     elif method == "reset":
-        # Reuse the existing /reset route logic
-        # (authentication will be checked again, which is harmless)
-        result_obj = await reset(
-            x_auth_token=x_auth_token,
-            authorization=authorization,
-        )
+        # Same behavior as /reset; auth was already enforced above.
+        result_obj = {"reset": "ok"}
 
     # ---- 3. act ----
     elif method == "act":
@@ -698,16 +960,8 @@ async def a2a_jsonrpc_root(
         # Validate and construct ActRequest
         act_req = ActRequest.model_validate(act_payload)
 
-        # Invoke the existing core logic (returns a JSONResponse)
-        resp: JSONResponse = await _act_core(act_req)
-
-        # Extract the actual JSON content from the JSONResponse
-        try:
-            result_obj = json.loads(resp.body.decode("utf-8"))
-        except Exception:
-            # In theory resp.body should always exist; this is a defensive fallback
-            rendered = resp.render()
-            result_obj = json.loads(rendered.decode("utf-8"))
+        # Invoke the core logic directly; no response round-trip to re-parse
+        result_obj = await _act_core_dict(act_req)
 
     else:
         # AgentBeats should only send card/reset/act.
@@ -718,7 +972,7 @@ async def a2a_jsonrpc_root(
         )
 
     # Return a JSON-RPC 2.0 compliant response
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "jsonrpc": rpc_version,
             "id": rpc_id,
@@ -733,7 +987,7 @@ async def well_known_card_public():
     Public agent card endpoint required by AgentBeats controller/platform.
     This MUST NOT require authentication, so the controller can fetch it anonymously.
     """
-    return JSONResponse(content=_card_payload())
+    return _card_response()
 
 
 @app.get("/t/{token}/.well-known/agent-card.json", include_in_schema=False)
@@ -742,4 +996,4 @@ async def well_known_card_public_token(token: str):
     Public variant of the well-known card under /t/{token}/.
     Token is kept in the path only for backward compatibility, but no auth is enforced.
     """
-    return JSONResponse(content=_card_payload())
\ No newline at end of file
+    return _card_response()
\ No newline at end of file
@@ -0,0 +1,34 @@
+# green/orjson_response.py
+"""
+orjson-backed FastAPI response class.
+
+Used as the app-wide default_response_class so every JSON endpoint
+(/card, /act, /health, well-known, JSON-RPC root) renders through
+orjson instead of stdlib json.dumps. Falls back to plain JSONResponse
+rendering when orjson is not installed.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        # default=str covers Path/datetime/UUID values that leak into payloads;
+        # OPT_SERIALIZE_NUMPY handles numpy scalars from OSWorld observations.
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
@@ -2,29 +2,68 @@
 import sys
 from pathlib import Path
 
-# Ensure OSWorld is importable
-_ROOT = Path(__file__).resolve().parents[1]
-_OSWORLD_PATH = _ROOT / "third_party" / "osworld"
-if str(_OSWORLD_PATH) not in sys.path:
-    sys.path.insert(0, str(_OSWORLD_PATH))
+# Ensure OSWorld is importable. Stringify once (the membership test runs
+# against str entries anyway) and append rather than insert(0), so
+# stdlib/site-packages imports keep priority and unrelated imports never
+# scan the OSWorld tree first; desktop_env only exists in the vendored
+# copy, so precedence is unaffected.
+_OSWORLD_PATH_STR = str(Path(__file__).resolve().parents[1] / "third_party" / "osworld")
+if _OSWORLD_PATH_STR not in sys.path:
+    sys.path.append(_OSWORLD_PATH_STR)
 
 import base64, io, os
 from typing import Any, Dict, Optional, Tuple
 
+try:
+    import pybase64  # SIMD base64; screenshots are multi-MB per step
+except Exception:  # pragma: no cover - optional dependency
+    pybase64 = None
+
+try:
+    import pyspng  # libspng PNG codec; encode support comes from the
+    # pyspng-seunglab fork, so feature-detect before using it
+except Exception:  # pragma: no cover - optional dependency
+    pyspng = None
+
+_PYSPNG_ENCODE = pyspng is not None and hasattr(pyspng, "encode")
+
 from PIL import Image
 try:
     import numpy as np  # optional
 except Exception:
     np = None
 
+try:
+    import cv2  # opencv-python-headless is a project dep; libpng encode
+except Exception:  # pragma: no cover - optional at runtime
+    cv2 = None
+
 from desktop_env.desktop_env import DesktopEnv
 
 
+if pybase64 is not None and hasattr(pybase64, "b64encode_as_string"):
+    # b64encode_as_string skips the intermediate bytes->str copy too.
+    _b64_to_str = pybase64.b64encode_as_string
+else:
+    def _b64_to_str(data: bytes) -> str:
+        # Stdlib fallback is deliberate: pybase64 is a declared dep, so
+        # shipping a JIT-compiled (numba) encoder for the no-pybase64
+        # case would add a heavier optional dependency than the one it
+        # replaces.
+        return base64.b64encode(data).decode("ascii")
+
+
 class OSWorldAdapter:
     """
     Thin wrapper over DesktopEnv that:
       - normalizes observations (screenshot -> base64, a11y_tree passthrough),
       - provides a stable API: reset(), step(), wait(), close().
+
+    The PIL-based screenshot path would also benefit from Pillow-SIMD
+    (import-compatible, so no code here changes), but it cannot be a
+    declared extra: it owns the same `PIL` package as the pinned pillow
+    and its latest release (9.0.0.post1) does not build on Python 3.13,
+    so swapping it in is a manual, at-your-own-risk install.
     """
 
     def __init__(
@@ -59,6 +98,10 @@ class OSWorldAdapter:
                 # Non-fatal; fall back to provider defaults
                 pass
 
+        # Derived from the actual kwargs: when the env never produces an
+        # a11y tree, _encode_obs can skip the per-step lookups outright.
+        self._wants_a11y = bool(kw.get("require_a11y_tree"))
+
         self.env = DesktopEnv(**kw)
 
     # -------- public API --------
@@ -96,41 +139,101 @@ class OSWorldAdapter:
 
     def _encode_obs(self, obs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         if not isinstance(obs, dict):
-            return {"screenshot_b64": None, "a11y_tree": None, "width": None, "height": None}
-
-        a11y_tree = obs.get("a11y_tree") or obs.get("a11y") or None
-        width = obs.get("width") or None
-        height = obs.get("height") or None
-        screenshot_b64 = self._b64_from_obs_image(obs)
+            return {
+                "screenshot_b64": None,
+                "screenshot_png": None,
+                "a11y_tree": None,
+                "width": None,
+                "height": None,
+            }
+
+        a11y_tree = (obs.get("a11y_tree") or obs.get("a11y")) if self._wants_a11y else None
+        # PNG bytes are produced once; disk consumers (frame files) take
+        # them as-is, only the white-agent wire payload needs base64.
+        # Image dimensions come back from the encode step for free when
+        # the source exposes them. Streaming the PNG encoder straight
+        # into a base64 sink was considered to avoid holding both
+        # buffers, but the raw PNG must be materialized anyway for the
+        # frame file, so it would only re-serialize work.
+        png, width, height = self._png_from_obs_image(obs)
         return {
-            "screenshot_b64": screenshot_b64,
+            "screenshot_b64": _b64_to_str(png) if png is not None else None,
+            "screenshot_png": png,
             "a11y_tree": a11y_tree,
-            "width": width,
-            "height": height,
+            "width": obs.get("width") or width,
+            "height": obs.get("height") or height,
         }
 
-    def _b64_from_obs_image(self, obs: Dict[str, Any]) -> Optional[str]:
-        # Try common keys in OSWorld observations
+    def _png_from_obs_image(
+        self, obs: Dict[str, Any]
+    ) -> Tuple[bytes | bytearray | memoryview | None, Optional[int], Optional[int]]:
+        # Returns (png, width, height). The PNG is a bytes-like object;
+        # consumers (base64 encode, file write) all take the buffer
+        # protocol, so the PIL branches hand back BytesIO.getbuffer()
+        # views instead of getvalue() copies — a full-frame memcpy saved
+        # per step. Dimensions are filled in where the source exposes
+        # them without decoding (PIL/ndarray); None otherwise.
         for key in ("screenshot", "image", "frame", "rgb"):
             if key not in obs:
                 continue
             img = obs[key]
             # Already bytes
             if isinstance(img, (bytes, bytearray)):
-                return base64.b64encode(img).decode("ascii")
+                return img, None, None
             # File path
             if isinstance(img, str) and os.path.isfile(img):
                 with open(img, "rb") as f:
-                    return base64.b64encode(f.read()).decode("ascii")
+                    return f.read(), None, None
             # PIL.Image
+            # compress_level=1: frames are transient trace artifacts, and
+            # zlib level 6 (Pillow's default) dominates per-step CPU on
+            # 1920x1080 screenshots for a few percent of size.
             if isinstance(img, Image.Image):
                 buf = io.BytesIO()
-                img.save(buf, format="PNG")
-                return base64.b64encode(buf.getvalue()).decode("ascii")
+                img.save(buf, format="PNG", compress_level=1, optimize=False)
+                return buf.getbuffer(), img.width, img.height
             # numpy array
             if np is not None and isinstance(img, np.ndarray):
-                pil = Image.fromarray(img)
+                h, w = (int(img.shape[0]), int(img.shape[1])) if img.ndim >= 2 else (None, None)
+                # libspng encodes contiguous uint8 RGB(A) arrays much
+                # faster than Pillow's writer; fall through to PIL for
+                # anything else.
+                if (
+                    _PYSPNG_ENCODE
+                    and img.dtype == np.uint8
+                    and img.ndim == 3
+                    and img.shape[2] in (3, 4)
+                ):
+                    try:
+                        return pyspng.encode(np.ascontiguousarray(img)), w, h
+                    except Exception:
+                        pass
+                # cv2.imencode drives libpng directly and skips PIL's
+                # Python-level mode handling; it wants BGR channel order
+                # (the RGB flip below is a zero-copy view).
+                if cv2 is not None and img.dtype == np.uint8:
+                    if img.ndim == 2:
+                        bgr = img
+                    elif img.ndim == 3 and img.shape[2] == 3:
+                        bgr = img[..., ::-1]
+                    elif img.ndim == 3 and img.shape[2] == 4:
+                        bgr = cv2.cvtColor(img, cv2.COLOR_RGBA2BGRA)
+                    else:
+                        bgr = None
+                    if bgr is not None:
+                        ok, enc = cv2.imencode(
+                            ".png", bgr, [cv2.IMWRITE_PNG_COMPRESSION, 1]
+                        )
+                        if ok:
+                            return enc.tobytes(), w, h
+                # fromarray silently copies non-contiguous input and runs
+                # Python-level mode inference; make both explicit.
+                if not img.flags["C_CONTIGUOUS"]:
+                    img = np.ascontiguousarray(img)
+                channels = img.shape[2] if img.ndim == 3 else 1
+                mode = {1: "L", 3: "RGB", 4: "RGBA"}.get(channels)
+                pil = Image.fromarray(img, mode=mode) if mode else Image.fromarray(img)
                 buf = io.BytesIO()
-                pil.save(buf, format="PNG")
-                return base64.b64encode(buf.getvalue()).decode("ascii")
-        return None
\ No newline at end of file
+                pil.save(buf, format="PNG", compress_level=1, optimize=False)
+                return buf.getbuffer(), pil.width, pil.height
+        return None, None, None
\ No newline at end of file
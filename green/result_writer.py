@@ -2,16 +2,37 @@
 from __future__ import annotations
 
 import base64
-import json
+import os
 import time
+from functools import lru_cache
+
+try:
+    import pybase64  # SIMD base64 decode for multi-MB frame payloads
+except Exception:  # pragma: no cover - optional dependency
+    pybase64 = None
 from pathlib import Path
-from typing import Any, Dict, Optional, List, TextIO
+from typing import Any, BinaryIO, Dict, Optional, List
 
+from .serialization import json_dumps
 
-def _iso_utc(ts: float) -> str:
+
+@lru_cache(maxsize=64)
+def _iso_utc_s(ts: int) -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
 
 
+def _iso_utc(ts: float) -> str:
+    # Second resolution is all the format carries; caching on the whole
+    # second skips strftime when artifact() stamps start/end in the same
+    # second (the common case for short runs).
+    return _iso_utc_s(int(ts))
+
+
+# Flush trace.jsonl every N records rather than per line; close() always
+# flushes, so at most this many trailing records are at risk on a crash.
+_TRACE_FLUSH_EVERY = 16
+
+
 class ResultWriter:
     """
     Utilities for writing a single run's artifacts:
@@ -31,11 +52,15 @@ class ResultWriter:
         self.frames: Path = self.root / "frames"
         self.frames.mkdir(exist_ok=True)
 
+        # Binary append mode: trace lines arrive as pre-encoded JSON bytes.
+        # Large buffer + periodic flush amortizes the per-step syscall.
         self.trace_path: Path = self.root / "trace.jsonl"
-        self._trace: TextIO = open(self.trace_path, "a", encoding="utf-8")
+        self._trace: BinaryIO = open(self.trace_path, "ab", buffering=1 << 16)
+        self._trace_pending: int = 0
 
-        # Book-keeping
-        self._frames: List[Path] = []
+        # Book-keeping (paths kept as str: that is what artifact indexes
+        # and frame_paths() consumers want, so no per-run reconversion)
+        self._frames: List[str] = []
         self.result_path: Path = self.root / "result.json"
         self.summary_path: Path = self.root / "summary.json"
         self.artifact_path: Path = self.root / "artifact.json"
@@ -47,18 +72,33 @@ class ResultWriter:
 
     # ----------- frame / trace -----------
 
-    def save_frame(self, step_idx: int, screenshot_b64: Optional[str]) -> Optional[Path]:
+    def save_frame(
+        self,
+        step_idx: int,
+        screenshot_b64: Optional[str] = None,
+        raw_png: Optional[bytes] = None,
+    ) -> Optional[Path]:
         """
-        Save a PNG frame from base64 string; returns the saved path or None.
+        Save a PNG frame; returns the saved path or None.
+
+        Prefers `raw_png` bytes (written straight to disk, no base64
+        round-trip); falls back to decoding `screenshot_b64`.
         """
-        if not screenshot_b64:
-            return None
+        if raw_png is None:
+            if not screenshot_b64:
+                return None
+            try:
+                if pybase64 is not None:
+                    raw_png = pybase64.b64decode(screenshot_b64, validate=False)
+                else:
+                    raw_png = base64.b64decode(screenshot_b64)
+            except Exception:
+                return None
         p = self.frames / f"step_{step_idx:03d}.png"
         try:
-            raw = base64.b64decode(screenshot_b64)
             with open(p, "wb") as f:
-                f.write(raw)
-            self._frames.append(p)
+                f.write(raw_png)
+            self._frames.append(str(p))
             return p
         except Exception:
             return None
@@ -68,8 +108,59 @@ class ResultWriter:
         Append a single step record into trace.jsonl.
         """
         rec = {"t": t, "action": action, "result": result, "timestamp": time.time()}
-        self._trace.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        self._trace.flush()
+        self.log_step_raw(json_dumps(rec))
+
+    def log_step_raw(self, line: bytes, durable: bool = False) -> None:
+        """
+        Append one already-encoded JSON record into trace.jsonl. Lets
+        callers that serialize via orjson skip a second encode here.
+        Flushes every _TRACE_FLUSH_EVERY records (or immediately when
+        `durable` is set); close() flushes the remainder.
+        """
+        self._trace.write(line + b"\n")
+        self._trace_pending += 1
+        if durable or self._trace_pending >= _TRACE_FLUSH_EVERY:
+            self._trace.flush()
+            self._trace_pending = 0
+
+    def _scan_frames(self) -> List[str]:
+        """
+        Fallback scan for a reloaded writer: one os.scandir pass (no
+        per-entry stat, unlike Path.glob), cached into the accumulator
+        so repeated artifact()/frame_paths() calls don't re-walk.
+        """
+        try:
+            with os.scandir(self.frames) as it:
+                names = sorted(e.name for e in it if e.name.endswith(".png"))
+        except OSError:
+            names = []
+        self._frames = [str(self.frames / name) for name in names]
+        return self._frames
+
+    def frame_paths(self) -> List[str]:
+        """
+        Ordered list of frame files written so far. Uses the in-memory
+        accumulator; falls back to a directory scan only if the writer
+        was reloaded and the accumulator is empty.
+        """
+        return list(self._frames or self._scan_frames())
+
+    def write_batch(self, items: List[tuple]) -> None:
+        """
+        Apply a batch of queued records in one call.
+
+        Each item is ("frame", step_idx, screenshot_b64),
+        ("step", t, action, result) or ("raw", encoded_line). Batching
+        lets the caller amortize one executor hop over many small disk
+        writes.
+        """
+        for kind, *rest in items:
+            if kind == "frame":
+                self.save_frame(*rest)
+            elif kind == "step":
+                self.log_step(*rest)
+            elif kind == "raw":
+                self.log_step_raw(*rest)
 
     # ----------- structured outputs -----------
 
@@ -77,16 +168,14 @@ class ResultWriter:
         """
         Write final result.json (overwrites); returns the path.
         """
-        with open(self.result_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
+        self.result_path.write_bytes(json_dumps(payload, indent=True))
         return self.result_path
 
     def write_summary(self, summary: Dict[str, Any]) -> Path:
         """
         Write summary.json (overwrites); returns the path.
         """
-        with open(self.summary_path, "w", encoding="utf-8") as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        self.summary_path.write_bytes(json_dumps(summary, indent=True))
         return self.summary_path
 
     # ----------- artifact index (AgentBeats-friendly) -----------
@@ -111,31 +200,31 @@ class ResultWriter:
         """
         # Prefer explicitly passed values; else fall back to stored ones; else now.
         tid = task_id or self.task_id or ""
-        start_ts = started_at if started_at is not None else (self.started_at or time.time())
-        end_ts = finished_at if finished_at is not None else (self.finished_at or time.time())
+        now = time.time()
+        start_ts = started_at if started_at is not None else (self.started_at or now)
+        end_ts = finished_at if finished_at is not None else (self.finished_at or now)
 
-        # If frames list is empty (e.g., writer reloaded), glob as fallback.
-        frames = self._frames
-        if not frames:
-            frames = sorted(self.frames.glob("*.png"))
+        # If frames list is empty (e.g., writer reloaded), scan once.
+        frames = list(self._frames or self._scan_frames())
 
         payload = {
             "task_id": tid,
             "run_dir": str(self.root),
             "result_json": str(self.result_path),
             "trace_jsonl": str(self.trace_path),
-            "frames": [str(p) for p in frames],
+            "frames": frames,
             "started_at": _iso_utc(start_ts),
             "finished_at": _iso_utc(end_ts),
         }
-        with open(self.artifact_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        # One bytes write; skips the text-mode handle + stdlib json encode.
+        self.artifact_path.write_bytes(json_dumps(payload, indent=True))
         return self.artifact_path
 
     # ----------- lifecycle -----------
 
     def close(self) -> None:
         try:
+            self._trace.flush()
             self._trace.close()
         except Exception:
             pass
@@ -0,0 +1,50 @@
+# green/serialization.py
+"""
+Fast JSON serialization helpers for the green agent.
+
+Prefers orjson (Rust, ~5x faster than stdlib json on the small/medium dicts
+we serialize per /act call) and transparently falls back to the stdlib when
+orjson is not installed. All helpers return *bytes* so callers can write
+them straight to disk or hash them without an extra encode step.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def json_dumps(obj: Any, *, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serialize `obj` to UTF-8 JSON bytes.
+
+    indent=True     -> 2-space indentation (artifact/result files)
+    sort_keys=True  -> deterministic key order (signatures/hashes)
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option, default=str)
+    # stdlib fallback; match orjson's compact separators when not indenting
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        sort_keys=sort_keys,
+        separators=None if indent else (",", ":"),
+        default=str,
+    ).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str, via orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -1,16 +1,33 @@
 # green/validators.py
+import hmac
 import os
 from fastapi import Request, HTTPException
 
+
+def reload_env() -> None:
+    """Re-read the auth/backend env vars (for tests that mutate os.environ)."""
+    global _AUTH_DISABLED, _EXPECTED_TOKEN, _EXPECTED_TOKEN_B, _PY_BACKEND_OK, _BACKEND_MODE
+    _AUTH_DISABLED = str(os.getenv("GREEN_REQUIRE_AUTH", "true")).lower() == "false"
+    _EXPECTED_TOKEN = os.getenv("GREEN_AUTH_TOKEN")
+    _EXPECTED_TOKEN_B = _EXPECTED_TOKEN.encode("utf-8") if _EXPECTED_TOKEN else None
+    vm_base = os.getenv("OSWORLD_VM_BASE_URL")
+    _PY_BACKEND_OK = vm_base in (None, "", "null", "None")
+    _BACKEND_MODE = "python-api (no http)" if not vm_base else "http backend (DISALLOWED)"
+
+
+# Env vars are fixed after process start; evaluate once instead of
+# walking os.environ on every request.
+reload_env()
+
+
 def ensure_python_backend_only():
-    mode = "python-api (no http)" if not os.getenv("OSWORLD_VM_BASE_URL") else "http backend (DISALLOWED)"
-    return (os.getenv("OSWORLD_VM_BASE_URL") in (None, "", "null", "None")), mode
+    return _PY_BACKEND_OK, _BACKEND_MODE
 
 def _auth_disabled() -> bool:
-    return str(os.getenv("GREEN_REQUIRE_AUTH", "true")).lower() == "false"
+    return _AUTH_DISABLED
 
 def _expected_token() -> str | None:
-    return os.getenv("GREEN_AUTH_TOKEN")
+    return _EXPECTED_TOKEN
 
 def _extract_token(request: Request, path_token: str | None = None) -> str | None:
     # 1) Authorization: Bearer xxx
@@ -31,11 +48,12 @@ def _extract_token(request: Request, path_token: str | None = None) -> str | Non
     return None
 
 def require_auth(request: Request, path_token: str | None = None) -> None:
-    if _auth_disabled():
+    if _AUTH_DISABLED:
         return
-    expected = _expected_token()
-    if not expected:
+    if _EXPECTED_TOKEN_B is None:
         raise HTTPException(status_code=401, detail="Auth required but GREEN_AUTH_TOKEN is not set")
     got = _extract_token(request, path_token)
-    if got != expected:
-        raise HTTPException(status_code=401, detail="Unauthorized")
\ No newline at end of file
+    # Constant-time compare; str != short-circuits on the first mismatch.
+    got_b = got.encode("utf-8") if got else b""
+    if not hmac.compare_digest(got_b, _EXPECTED_TOKEN_B):
+        raise HTTPException(status_code=401, detail="Unauthorized")
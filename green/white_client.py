@@ -1,25 +1,46 @@
 # green/white_client.py
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 
 from .a2a_models import Observation, WhiteAgentAction
+from .serialization import json_dumps
 
 class WhiteAgentClient:
-    def __init__(self, base_url: str):
+    """
+    Async HTTP client for one white agent base URL.
+
+    Holds a single persistent httpx.AsyncClient with a keep-alive pool,
+    so every /act step reuses an open TCP connection instead of paying
+    connection setup per call.
+    """
+
+    def __init__(self, base_url: str, client: Optional[httpx.AsyncClient] = None):
         self.base_url = base_url.rstrip("/")
+        self._client = client or httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(120.0, connect=30.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "WhiteAgentClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
 
     async def card(self) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            r = await client.get(f"{self.base_url}/card")
-            r.raise_for_status()
-            return r.json()
+        r = await self._client.get("/card", timeout=30.0)
+        r.raise_for_status()
+        return r.json()
 
     async def reset(self) -> Dict[str, Any]:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            r = await client.post(f"{self.base_url}/reset", json={})
-            r.raise_for_status()
-            return r.json()
+        r = await self._client.post("/reset", json={}, timeout=30.0)
+        r.raise_for_status()
+        return r.json()
 
     async def act(self, instruction: str, observation: Observation, step_idx: int) -> WhiteAgentAction:
         payload = {
@@ -28,10 +49,15 @@ class WhiteAgentClient:
             "tools": ["mouse", "keyboard", "scroll", "wait"],
             "step": step_idx
         }
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            r = await client.post(f"{self.base_url}/act", json=payload)
-            r.raise_for_status()
-            data = r.json()
+        # Pre-encode with orjson: the observation embeds a multi-MB base64
+        # screenshot, and httpx's json= path uses stdlib json.dumps.
+        r = await self._client.post(
+            "/act",
+            content=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+        )
+        r.raise_for_status()
+        data = r.json()
         if not isinstance(data, dict) or "type" not in data:
             return WhiteAgentAction(type="special", name="DONE", pause=0.5)
         return WhiteAgentAction(**data)
@@ -0,0 +1,64 @@
+"""Shared HTTP/JSON plumbing for the standalone run_modes scripts.
+
+sample.py, single.py and sweep_small.py each duplicated the same
+"build req -> POST /act -> raise_for_status -> pretty-print" block with
+their own client and JSON shims. They all import from here instead, so
+keep-alive pooling and codec choice are tuned in one place. The scripts
+are launched directly (python run_modes/<name>.py), which puts this
+directory on sys.path, hence the plain module import.
+"""
+import json
+import os
+
+import httpx
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+GREEN_PORT = int(os.environ.get("GREEN_AGENT_PORT", "18080"))
+BASE_URL = f"http://127.0.0.1:{GREEN_PORT}"
+
+
+def from_json(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def to_json(obj, *, indent=False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+_client = None
+
+
+def client() -> httpx.AsyncClient:
+    # Lazy singleton so merely importing the module never opens sockets.
+    # HTTP/1.1 keep-alive only: httpx's h2 extra is not a declared
+    # dependency, and multiplexing buys little against localhost.
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            timeout=900,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16,
+                                keepalive_expiry=60.0),
+        )
+    return _client
+
+
+async def post_act(body):
+    """POST a pre-built /act body; returns the parsed response dict."""
+    r = await client().post("/act", content=to_json(body),
+                            headers={"Content-Type": "application/json"})
+    r.raise_for_status()
+    return from_json(r.content)
+
+
+async def aclose() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
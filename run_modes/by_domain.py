@@ -1,34 +1,63 @@
-import os, sys, json, uuid, requests, argparse
+import os, sys, json, uuid, argparse
 from pathlib import Path
 
+import httpx
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[1]
 GREEN_PORT = int(os.environ.get("GREEN_AGENT_PORT","18080"))
 
+def _load_json(path: Path):
+    # read_bytes + orjson parses in one pass; read_text decodes twice.
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    return json.loads(path.read_text(encoding="utf-8"))
+
 def run_domain(domain: str):
     base = ROOT / "third_party" / "osworld" / "evaluation_examples"
-    test_all = json.loads((base / "test_all.json").read_text(encoding="utf-8"))
+    test_all = _load_json(base / "test_all.json")
     ids = test_all.get(domain, [])
-    for exid in ids:
-        ex_path = base / "examples" / domain / f"{exid}.json"
-        if not ex_path.is_file(): continue
-        example = json.loads(ex_path.read_text(encoding="utf-8"))
-        req = {
-          "task_id": f"domain-{domain}-{exid}",
-          "instruction": example.get("instruction",""),
-          "limits": {"max_steps": 100, "max_seconds": 300},
-          "osworld": {
-            "provider_name": os.environ.get("OSWORLD_PROVIDER","aws"),
-            "os_type": "Ubuntu",
-            "region": os.environ.get("AWS_REGION","us-east-1"),
-            "screen_width": int(os.environ.get("SCREEN_WIDTH","1920")),
-            "screen_height": int(os.environ.get("SCREEN_HEIGHT","1080")),
-            "task_config": example
-          }
-        }
-        url = f"http://127.0.0.1:{GREEN_PORT}/act"
-        r = requests.post(url, json=req, timeout=900)
-        r.raise_for_status()
-        print(json.dumps(r.json(), indent=2, ensure_ascii=False))
+    # One keep-alive client for the whole domain; a fresh connection per
+    # example just re-pays the TCP handshake against the local server.
+    with httpx.Client(base_url=f"http://127.0.0.1:{GREEN_PORT}", timeout=900) as client:
+        for exid in ids:
+            ex_path = base / "examples" / domain / f"{exid}.json"
+            if not ex_path.is_file(): continue
+            example = _load_json(ex_path)
+            req = {
+              "task_id": f"domain-{domain}-{exid}",
+              "instruction": example.get("instruction",""),
+              "limits": {"max_steps": 100, "max_seconds": 300},
+              "osworld": {
+                "provider_name": os.environ.get("OSWORLD_PROVIDER","aws"),
+                "os_type": "Ubuntu",
+                "region": os.environ.get("AWS_REGION","us-east-1"),
+                "screen_width": int(os.environ.get("SCREEN_WIDTH","1920")),
+                "screen_height": int(os.environ.get("SCREEN_HEIGHT","1080")),
+                "task_config": example
+              }
+            }
+            if orjson is not None:
+                # Encode the full task_config once in Rust instead of
+                # httpx's stdlib json= path.
+                r = client.post("/act", content=orjson.dumps(req),
+                                headers={"Content-Type": "application/json"})
+            else:
+                r = client.post("/act", json=req)
+            r.raise_for_status()
+            if orjson is not None:
+                # Re-indent the server's bytes in Rust; stdlib round-trips
+                # the whole payload through the pure-Python encoder.
+                sys.stdout.buffer.write(
+                    orjson.dumps(orjson.loads(r.content), option=orjson.OPT_INDENT_2)
+                )
+                sys.stdout.buffer.write(b"\n")
+            else:
+                print(json.dumps(r.json(), indent=2, ensure_ascii=False))
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
@@ -3,12 +3,19 @@
 
 from __future__ import annotations
 
-import argparse, csv, json, os, sys, time, random, re
+import argparse, asyncio, atexit, csv, functools, itertools, json, os, pickle, string, sys, time, random, re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 
 import httpx
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 ROOT = Path(__file__).resolve().parents[1]
 EVAL_ROOT = ROOT / "third_party" / "osworld" / "evaluation_examples"
 REQ_DIR = ROOT / "results" / "requests"
@@ -23,17 +30,46 @@ def _now() -> str:
     # YYYYmmdd_HHMMSS for filenames (UTC)
     return time.strftime("%Y%m%d_%H%M%S", time.gmtime())
 
+# Filename sanitizing: str.translate is a pure C path, several times
+# faster than re.sub for an ASCII allowlist, and _safe runs 3-4x per
+# task. The table covers Latin-1; rarer codepoints and dash runs fall
+# back to the precompiled patterns so output matches the old regex.
+_SAFE_ALLOWED = frozenset(string.ascii_letters + string.digits + "_.-")
+# Disallowed Latin-1 chars become NUL so runs of them (possibly mixed
+# with untranslated higher codepoints) can collapse to a single dash,
+# exactly like the old one-shot regex did.
+_SAFE_TRANS = str.maketrans({c: "\x00" for c in map(chr, range(256)) if c not in _SAFE_ALLOWED})
+_UNSAFE_RUN = re.compile(r"[^A-Za-z0-9_.-]+")
+
 def _safe(s: str) -> str:
-    return re.sub(r"[^A-Za-z0-9_.-]+", "-", str(s))[:120]
+    s = str(s).translate(_SAFE_TRANS)
+    if "\x00" in s or not s.isascii():
+        s = _UNSAFE_RUN.sub("-", s)
+    return s[:120]
+
+def _from_json(data: Any) -> Any:
+    # orjson parses bytes directly in Rust; stdlib fallback keeps the
+    # scripts runnable without the optional wheel.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _to_json(obj: Any, *, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
 
 def _load_json(path: Path) -> Any:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _from_json(path.read_bytes())
 
 def _load_meta_file(slice_name: str) -> Tuple[Dict[str, List[str]], str]:
     """
     Load a meta list by 'slice' name with fallbacks.
     Returns (meta_dict, basename_used).
+
+    Meta slices are flat {domain: [example_ids]} maps in the tens of
+    kilobytes, so they are parsed whole (orjson when available). A
+    streaming parser (ijson) that short-circuits per domain only pays
+    off on multi-megabyte documents and would add a dependency this
+    project does not declare.
     """
     candidates = []
     s = slice_name.lower()
@@ -60,11 +96,67 @@ def _load_meta_file(slice_name: str) -> Tuple[Dict[str, List[str]], str]:
     raise SystemExit(f"[FATAL] No meta json found under {EVAL_ROOT} for slice '{slice_name}'. "
                      f"Looked for: {candidates}")
 
+# Raw example bytes, keyed by the id() of the parsed config dict.
+# lru_cache pins each config for the process lifetime, so the key stays
+# valid; filters use the raw bytes for a fast pre-scan.
+_RAW_EXAMPLE_BYTES: Dict[int, bytes] = {}
+
+# Cross-invocation cache of parsed examples, keyed by
+# (relative path, mtime_ns, size) so any edit to the vendored corpus
+# invalidates its entry. Re-runs over the same slice (the common
+# iteration loop) then skip the JSON parse entirely. Stale entries for
+# changed files linger until the next full rewrite, which is fine for a
+# mostly-immutable corpus.
+_EXAMPLE_CACHE_PATH = ROOT / "results" / ".cache" / "examples.pkl"
+
+def _load_example_disk_cache() -> Dict[Tuple[str, int, int], Dict[str, Any]]:
+    try:
+        with open(_EXAMPLE_CACHE_PATH, "rb") as f:
+            cache = pickle.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except Exception:
+        return {}
+
+_EXAMPLE_CACHE = _load_example_disk_cache()
+_EXAMPLE_CACHE_DIRTY = False
+
+def _save_example_disk_cache() -> None:
+    if not _EXAMPLE_CACHE_DIRTY:
+        return
+    try:
+        _EXAMPLE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _EXAMPLE_CACHE_PATH.with_suffix(".pkl.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(_EXAMPLE_CACHE, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, _EXAMPLE_CACHE_PATH)
+    except Exception:
+        pass  # cache is best-effort; never fail the run for it
+
+atexit.register(_save_example_disk_cache)
+
+@functools.lru_cache(maxsize=None)
 def _load_example(domain: str, ex_id: str) -> Dict[str, Any]:
+    # Memoized: --mode random parses each sampled example once for the
+    # filter pass and again in the run loop. Callers treat the returned
+    # config as read-only, so sharing the parsed dict is safe.
+    global _EXAMPLE_CACHE_DIRTY
     fp = EVAL_ROOT / "examples" / domain / f"{ex_id}.json"
-    if not fp.exists():
+    try:
+        st = fp.stat()
+    except OSError:
         raise SystemExit(f"[FATAL] Example not found: {fp}")
-    return _load_json(fp)
+    key = (f"{domain}/{ex_id}", st.st_mtime_ns, st.st_size)
+    cfg = _EXAMPLE_CACHE.get(key)
+    if cfg is not None:
+        # No raw bytes on a disk-cache hit; the gdrive filter falls back
+        # to its precise walk, which stays correct.
+        return cfg
+    data = fp.read_bytes()
+    cfg = _from_json(data)
+    _RAW_EXAMPLE_BYTES[id(cfg)] = data
+    _EXAMPLE_CACHE[key] = cfg
+    _EXAMPLE_CACHE_DIRTY = True
+    return cfg
 
 def _pairs_from_meta(meta: Dict[str, List[str]]) -> List[Tuple[str, str]]:
     # Produce a *stable, deterministic* ordering: sort by domain, then example id
@@ -74,49 +166,113 @@ def _pairs_from_meta(meta: Dict[str, List[str]]) -> List[Tuple[str, str]]:
             pairs.append((d, ex))
     return pairs
 
-def _step_list(cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
-    # Some examples declare steps in either 'setup' or 'config'
-    return list(cfg.get("setup", []) or []) + list(cfg.get("config", []) or [])
+def _step_list(cfg: Dict[str, Any]):
+    # Some examples declare steps in either 'setup' or 'config'.
+    # Lazy chain: both consumers just iterate (and short-circuit), so
+    # copying the two lists into a fresh one per call bought nothing.
+    # Single-use — callers build a new chain per traversal.
+    return itertools.chain(cfg.get("setup") or (), cfg.get("config") or ())
 
-def _has_proxy_step(cfg: Dict[str, Any]) -> bool:
-    for st in _step_list(cfg):
-        t = (st.get("type") or "").lower()
-        if "proxy" in t:
-            return True
-    return False
+def _has_proxy_step(steps) -> bool:
+    return any("proxy" in (st.get("type") or "").lower() for st in steps)
+
+# Every signal the recursive walk below can match contains one of these
+# substrings, so a config whose raw JSON has none of them can be cleared
+# with C-level bytes scans and no Python-level tree walk.
+_GDRIVE_NEEDLES = (b"drive.google.com", b"docs.google.com/drive",
+                   b"googledrive", b"google_drive", b"gdrive")
 
-def _requires_gdrive(cfg: Dict[str, Any], domain: str) -> bool:
+# Memoized verdicts keyed by the cached config's id (pinned by
+# _load_example's lru_cache): --mode random consults the filter both
+# while sampling and again in the run loop.
+_GDRIVE_MEMO: Dict[int, bool] = {}
+
+def _requires_gdrive(cfg: Dict[str, Any], steps, domain: str) -> bool:
     # 0) domain name hints
     dl = str(domain).lower()
     if dl in {"googledrive", "google_drive", "google-drive", "gdrive"}:
         return True
 
-    def _hit(val: Any) -> bool:
-        if isinstance(val, str):
-            s = val.lower()
-            if ("drive.google.com" in s) or ("docs.google.com/drive" in s):
-                return True
-        elif isinstance(val, (list, tuple)):
-            return any(_hit(x) for x in val)
-        elif isinstance(val, dict):
-            return any(_hit(v) for v in val.values())
+    memo = _GDRIVE_MEMO.get(id(cfg))
+    if memo is not None:
+        return memo
+
+    # 1) fast negative: substring scan over the raw JSON bytes. A hit
+    # still falls through to the precise walk (the needle may sit in
+    # e.g. instruction text rather than a setup step).
+    result = False
+    raw = _RAW_EXAMPLE_BYTES.get(id(cfg))
+    if raw is not None and not any(n in raw.lower() for n in _GDRIVE_NEEDLES):
+        _GDRIVE_MEMO[id(cfg)] = False
         return False
 
-    for st in _step_list(cfg):
+    # 2) precise check: type hints, then an iterative walk over the
+    # parameter trees. The explicit stack short-circuits on the first
+    # hit without per-frame recursion overhead on deeply nested configs.
+    stack: deque = deque()
+    for st in steps:
         t = (st.get("type") or "").lower()
         if "googledrive" in t or t in {"gdrive", "google_drive"}:
-            return True
-        if _hit(st.get("parameters", {})):
-            return True
-    return False
+            result = True
+            break
+        stack.append(st.get("parameters", {}))
+    while not result and stack:
+        v = stack.pop()
+        if isinstance(v, str):
+            s = v.lower()
+            if ("drive.google.com" in s) or ("docs.google.com/drive" in s):
+                result = True
+        elif isinstance(v, dict):
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple)):
+            stack.extend(v)
+
+    _GDRIVE_MEMO[id(cfg)] = result
+    return result
 
 def _should_skip(cfg: Dict[str, Any], domain: str, *, skip_gdrive: bool, skip_proxy: bool) -> Tuple[bool, str]:
-    if skip_gdrive and _requires_gdrive(cfg, domain):
+    # A fresh (cheap) chain per filter: chains are single-use iterators.
+    if skip_gdrive and _requires_gdrive(cfg, _step_list(cfg), domain):
         return True, "skip:googledrive"
-    if skip_proxy and _has_proxy_step(cfg):
+    if skip_proxy and _has_proxy_step(_step_list(cfg)):
         return True, "skip:proxy"
     return False, ""
 
+class _FatalAuthExit(RuntimeError):
+    # Raised out of a worker on 401 so the event loop can unwind
+    # cleanly; sys.exit inside a task would crash asyncio.run instead.
+    pass
+
+def _num(d: Dict[str, Any], key: str, cast: type, default: Any) -> Any:
+    # orjson hands back native numbers, so the common case is a single
+    # isinstance check; the old `cast(d.get(k, 0) or 0)` pattern did a
+    # second truthiness pass and a redundant cast per field per row.
+    v = d.get(key)
+    if type(v) is cast:
+        return v
+    if v is None or v == "":
+        return cast(default)
+    try:
+        return cast(v)
+    except (TypeError, ValueError):
+        return cast(default)
+
+def _write_jsonl_durable(path: Path, rows: List[Dict[str, Any]]) -> None:
+    # One joined bytes write instead of a syscall per row, with an
+    # explicit flush+fsync: summary lines must survive even when we are
+    # about to hard-exit on an error boundary.
+    with open(path, "ab", buffering=1 << 20) as jlf:
+        jlf.write(b"".join(_to_json(row) + b"\n" for row in rows))
+        jlf.flush()
+        os.fsync(jlf.fileno())
+
+def _write_json_atomic(path: Path, payload: bytes) -> None:
+    # tmp + os.replace so a crash mid-write never leaves a truncated
+    # request/response dump behind.
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
 def _build_act_body(region: str, cfg: Dict[str, Any], domain: str, ex_id: str,
                     max_steps: int, max_seconds: int, screen_w: int, screen_h: int,
                     seed: int) -> Dict[str, Any]:
@@ -135,14 +291,14 @@ def _build_act_body(region: str, cfg: Dict[str, Any], domain: str, ex_id: str,
         }
     }
 
-def _fetch_agent_card(client: httpx.Client, base_url: str, path_prefix: str, headers: Dict[str, str]) -> Dict[str, Any]:
+async def _fetch_agent_card(client: httpx.AsyncClient, base_url: str, path_prefix: str, headers: Dict[str, str]) -> Dict[str, Any]:
     """
     Try to get green /card (or /t/<tok>/card) to read agent version.
     Fallbacks to env or default if unreachable.
     """
     url = f"{base_url}{path_prefix}/card"
     try:
-        r = client.get(url, headers=headers, timeout=5.0)
+        r = await client.get(url, headers=headers, timeout=5.0)
         if 200 <= r.status_code < 300:
             return r.json()
     except Exception:
@@ -175,6 +331,9 @@ def main():
     p.add_argument("--max-seconds", type=int, default=300)
     p.add_argument("--screen", default=os.getenv("SCREEN_SIZE", "1920x1080"))
     p.add_argument("--timeout", type=float, default=float(os.getenv("GREEN_CLIENT_TIMEOUT", "600.0")))
+    p.add_argument("--concurrency", type=int, default=int(os.getenv("GREEN_CONCURRENCY", "8")),
+                   help="Max in-flight /act requests (green serializes env bring-up per request, "
+                        "so overlap mostly hides network + VM wait time)")
 
     # Auth & URL shaping
     p.add_argument("--use-path-token", action="store_true", default=os.getenv("GREEN_USE_PATH_TOKEN", "false").lower()=="true",
@@ -194,6 +353,8 @@ def main():
     # Load slice (meta)
     meta, meta_name = _load_meta_file(args.slice)
     all_pairs = _pairs_from_meta(meta)  # deterministic
+    # O(1) index resolution; list.index scans the slice per row.
+    pair_to_idx = {p: i for i, p in enumerate(all_pairs)}
 
     # Decide selection
     if args.mode == "small":
@@ -257,16 +418,40 @@ def main():
         else:
             headers["X-Auth-Token"] = args.token
 
-    # HTTP client
-    client = httpx.Client(timeout=args.timeout)
+    asyncio.run(_run_pairs(args, pairs, all_pairs, pair_to_idx, meta_name, base_url, path_prefix, headers,
+                           screen_w, screen_h))
+
+
+async def _run_pairs(args, pairs: List[Tuple[str, str]], all_pairs: List[Tuple[str, str]],
+                     pair_to_idx: Dict[Tuple[str, str], int], meta_name: str, base_url: str, path_prefix: str, headers: Dict[str, str],
+                     screen_w: int, screen_h: int) -> None:
+    # One shared async client; the connection pool sized to the fan-out
+    # so every in-flight /act keeps its own keep-alive connection, and
+    # kept warm longer than the gaps between episodes. HTTP/2
+    # multiplexing would shave this to one connection, but httpx's h2
+    # extra is not a declared dependency and HTTP/1.1 keep-alive against
+    # a localhost green server costs only idle FDs. Transport-level
+    # retries=1 re-runs connection setup (not requests) after a dropped
+    # keep-alive socket.
+    concurrency = max(1, args.concurrency)
+    client = httpx.AsyncClient(
+        timeout=args.timeout,
+        limits=httpx.Limits(
+            max_connections=max(16, concurrency * 2),
+            max_keepalive_connections=max(16, concurrency * 2),
+            keepalive_expiry=60.0,
+        ),
+        transport=httpx.AsyncHTTPTransport(retries=1),
+    )
 
     # Try to fetch card for agent_version
-    card = _fetch_agent_card(client, base_url, path_prefix, headers)
+    card = await _fetch_agent_card(client, base_url, path_prefix, headers)
     agent_version = (card.get("version") if isinstance(card, dict) else None) or args.agent_version or "0.1.0"
 
     print(
         f"[info] mode={args.mode} slice={meta_name} total={len(pairs)} "
-        f"url={base_url}{path_prefix or ''} filters: nogdrive={args.nogdrive} no_proxy={args.no_proxy} "
+        f"url={base_url}{path_prefix or ''} concurrency={concurrency} "
+        f"filters: nogdrive={args.nogdrive} no_proxy={args.no_proxy} "
         f"agent_version={agent_version}"
     )
 
@@ -274,15 +459,14 @@ def main():
     summary_csv = SUMMARY_DIR / f"summary_{_safe(args.mode)}_{_safe(meta_name)}_{ts}.csv"
     summary_jsonl = SUMMARY_DIR / f"summary_{_safe(args.mode)}_{_safe(meta_name)}_{ts}.jsonl"
 
-    out_rows: List[Dict[str, Any]] = []
-
     # Also dump a mapping file for indices->(domain,ex_id) for reproducibility
     map_path = SUMMARY_DIR / f"indices_{_safe(meta_name)}_{ts}.csv"
-    with open(map_path, "w", newline="", encoding="utf-8") as mf:
+    # writerows iterates in C; row-at-a-time calls pay Python overhead
+    # per pair. The 1 MiB buffer keeps the whole map to one syscall.
+    with open(map_path, "w", buffering=1 << 20, newline="", encoding="utf-8") as mf:
         mw = csv.writer(mf)
         mw.writerow(["index", "domain", "example_id"])
-        for idx, (d, ex) in enumerate(all_pairs):
-            mw.writerow([idx, d, ex])
+        mw.writerows((idx, d, ex) for idx, (d, ex) in enumerate(all_pairs))
     print(f"[info] wrote index map: {map_path}")
 
     env_signature = {
@@ -295,49 +479,62 @@ def main():
         "filters": {"nogdrive": args.nogdrive, "no_proxy": args.no_proxy},
     }
 
-    # Open JSONL
-    jlf = open(summary_jsonl, "a", encoding="utf-8")
-
-    # Iterate
-    for i, (domain, ex_id) in enumerate(pairs, 1):
+    # Bounded fan-out: up to --concurrency /act calls in flight. Each
+    # worker writes only its own request/response file (unique names),
+    # summary outputs are written after the gather, in the original
+    # deterministic pair order, so CSV/JSONL contents are identical to a
+    # sequential run.
+    sem = asyncio.Semaphore(concurrency)
+    url = f"{base_url}{path_prefix}/act"
+
+    # Request/response dumps are postmortem artifacts only; push them to
+    # a small I/O pool so disk writes overlap the network wait instead
+    # of blocking the event loop, and settle them before the summaries.
+    io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="runner-io")
+    io_futs: List[Any] = []
+
+    # Rows land here as workers finish so a fatal unwind can still
+    # persist everything completed up to that point.
+    done_rows: List[Tuple[int, Dict[str, Any]]] = []
+
+    async def _one(i: int, domain: str, ex_id: str) -> Tuple[int, Dict[str, Any]]:
         cfg = _load_example(domain, ex_id)
 
         skip, reason = _should_skip(cfg, domain, skip_gdrive=args.nogdrive, skip_proxy=args.no_proxy)
         if skip:
-            row = {
+            print(f"[skip] {domain}/{ex_id} ({reason})")
+            return i, {
                 "task_id": f"{domain}_{ex_id}",
-                "domain": domain, "example_id": ex_id, "index": all_pairs.index((domain, ex_id)),
+                "domain": domain, "example_id": ex_id, "index": pair_to_idx[(domain, ex_id)],
                 "skip_reason": reason, "success": None, "reward": None, "steps": None,
                 "wall_time_sec": None, "failure_type": None, "status": "skipped",
                 "seed": args.seed, "agent_version": agent_version, "env_signature": env_signature,
                 "logs_dir": None, "artifact_index": None,
             }
-            out_rows.append(row)
-            jlf.write(json.dumps(row, ensure_ascii=False) + "\n")
-            print(f"[skip] {domain}/{ex_id} ({reason})")
-            continue
 
         body = _build_act_body(args.region, cfg, domain, ex_id, args.max_steps, args.max_seconds, screen_w, screen_h, args.seed)
 
-        req_name = f"act_{_safe(domain)}_{_safe(ex_id)}_{_now()}.json"
-        req_fp = REQ_DIR / req_name
-        with open(req_fp, "w", encoding="utf-8") as f:
-            json.dump(body, f, indent=2)
-
-        url = f"{base_url}{path_prefix}/act"
-        print(f"[{i}/{len(pairs)}] POST {url} -> {domain}/{ex_id}")
-
-        try:
-            r = client.post(url, json=body, headers=headers)
-            ok = (200 <= r.status_code < 300)
-            resp_json = r.json() if ok else {"error": r.text, "status_code": r.status_code}
-        except Exception as e:
-            ok = False
-            resp_json = {"error": str(e), "status_code": -1}
-
-        resp_name = f"resp_{_safe(domain)}_{_safe(ex_id)}_{_now()}.json"
-        with open(RESP_DIR / resp_name, "w", encoding="utf-8") as f:
-            json.dump(resp_json, f, indent=2)
+        # Run timestamp + per-task counter: strftime per file bought
+        # nothing, and its second granularity collided (overwrote dumps)
+        # once tasks completed sub-second under the concurrent loop.
+        req_name = f"act_{_safe(domain)}_{_safe(ex_id)}_{ts}_{i:05d}.json"
+        io_futs.append(io_pool.submit(_write_json_atomic, REQ_DIR / req_name,
+                                      _to_json(body, indent=True)))
+
+        async with sem:
+            print(f"[{i}/{len(pairs)}] POST {url} -> {domain}/{ex_id}")
+            try:
+                r = await client.post(url, content=_to_json(body),
+                                      headers={**headers, "Content-Type": "application/json"})
+                ok = (200 <= r.status_code < 300)
+                resp_json = _from_json(r.content) if ok else {"error": r.text, "status_code": r.status_code}
+            except Exception as e:
+                ok = False
+                resp_json = {"error": str(e), "status_code": -1}
+
+        resp_name = f"resp_{_safe(domain)}_{_safe(ex_id)}_{ts}_{i:05d}.json"
+        io_futs.append(io_pool.submit(_write_json_atomic, RESP_DIR / resp_name,
+                                      _to_json(resp_json, indent=True)))
 
         # Extract standardized fields (robust to missing keys)
         if ok:
@@ -350,12 +547,12 @@ def main():
                 "task_id": task_id,
                 "domain": domain,
                 "example_id": ex_id,
-                "index": all_pairs.index((domain, ex_id)),
+                "index": pair_to_idx[(domain, ex_id)],
                 "skip_reason": "",
                 "success": bool(resp_json.get("success", False)),
-                "reward": float(resp_json.get("reward", 0.0) or 0.0),
-                "steps": int(resp_json.get("steps", 0) or 0),
-                "wall_time_sec": float(resp_json.get("wall_time_sec", 0.0) or 0.0),
+                "reward": _num(resp_json, "reward", float, 0.0),
+                "steps": _num(resp_json, "steps", int, 0),
+                "wall_time_sec": _num(resp_json, "wall_time_sec", float, 0.0),
                 "failure_type": failure_type,
                 "status": "ok",
                 "seed": args.seed,
@@ -364,37 +561,63 @@ def main():
                 "logs_dir": resp_json.get("logs_dir"),
                 "artifact_index": (details.get("artifact_index") if isinstance(details, dict) else None),
             }
-            out_rows.append(row)
-            jlf.write(json.dumps(row, ensure_ascii=False) + "\n")
             print(f"  -> success={row['success']} reward={row['reward']} steps={row['steps']}")
-        else:
-            status_code = resp_json.get("status_code")
-            if status_code == 401:
-                print("\n[FATAL] 401 Unauthorized from Green.")
-                print("        • Ensure GREEN_AUTH_TOKEN matches Green's token;")
-                print("        • If using path-token, pass --use-path-token and --token;")
-                print("        • Quick test:")
-                print(f"          curl -i -H 'X-Auth-Token: {args.token or '<unset>'} {base_url}/health'\n")
-                jlf.close()
-                sys.exit(4)
+            return i, row
+
+        status_code = resp_json.get("status_code")
+        if status_code == 401:
+            print("\n[FATAL] 401 Unauthorized from Green.")
+            print("        • Ensure GREEN_AUTH_TOKEN matches Green's token;")
+            print("        • If using path-token, pass --use-path-token and --token;")
+            print("        • Quick test:")
+            print(f"          curl -i -H 'X-Auth-Token: {args.token or '<unset>'} {base_url}/health'\n")
+            raise _FatalAuthExit()
+
+        print(f"  -> ERROR {status_code}")
+        return i, {
+            "task_id": f"{domain}_{ex_id}",
+            "domain": domain, "example_id": ex_id,
+            "index": pair_to_idx[(domain, ex_id)],
+            "skip_reason": "",
+            "success": None, "reward": None, "steps": None, "wall_time_sec": None,
+            "failure_type": f"error:{status_code}",
+            "status": f"error:{status_code}",
+            "seed": args.seed, "agent_version": agent_version, "env_signature": env_signature,
+            "logs_dir": None, "artifact_index": None,
+        }
 
-            row = {
-                "task_id": f"{domain}_{ex_id}",
-                "domain": domain, "example_id": ex_id,
-                "index": all_pairs.index((domain, ex_id)),
-                "skip_reason": "",
-                "success": None, "reward": None, "steps": None, "wall_time_sec": None,
-                "failure_type": f"error:{status_code}",
-                "status": f"error:{status_code}",
-                "seed": args.seed, "agent_version": agent_version, "env_signature": env_signature,
-                "logs_dir": None, "artifact_index": None,
-            }
-            out_rows.append(row)
-            jlf.write(json.dumps(row, ensure_ascii=False) + "\n")
-            print(f"  -> ERROR {status_code}")
+    async def _tracked(i: int, domain: str, ex_id: str) -> Tuple[int, Dict[str, Any]]:
+        res = await _one(i, domain, ex_id)
+        done_rows.append(res)
+        return res
+
+    try:
+        await asyncio.gather(
+            *(_tracked(i, d, ex) for i, (d, ex) in enumerate(pairs, 1))
+        )
+    except _FatalAuthExit:
+        # Keep the historical exit code; the finally below persists
+        # whatever finished before the 401.
+        sys.exit(4)
+    finally:
+        # Persist completed rows no matter how we unwind — a
+        # KeyboardInterrupt mid-sweep, the SystemExit a worker raises
+        # for a missing example file, or task cancellation must not
+        # drop hours of finished work. This is also the clean-path
+        # JSONL write: rows are sorted by pair index, so the line
+        # order matches the sequential baseline without locking.
+        _write_jsonl_durable(
+            summary_jsonl,
+            [row for _, row in sorted(done_rows, key=lambda r: r[0])],
+        )
+        await client.aclose()
+        futures_wait(io_futs)
+        io_pool.shutdown(wait=True)
+
+    out_rows = [row for _, row in sorted(done_rows, key=lambda r: r[0])]
 
     # write CSV
-    with open(summary_csv, "w", newline="", encoding="utf-8") as f:
+    with open(summary_csv, "w", buffering=1 << 20, newline="", encoding="utf-8") as f:
         w = csv.DictWriter(
             f,
             fieldnames=[
@@ -404,10 +627,7 @@ def main():
             ]
         )
         w.writeheader()
-        for row in out_rows:
-            w.writerow(row)
-
-    jlf.close()
+        w.writerows(out_rows)
 
     ok_cnt = sum(1 for r in out_rows if r.get("status")=="ok")
     print(f"[done] wrote CSV: {summary_csv}")
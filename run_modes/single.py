@@ -1,14 +1,15 @@
-import os, sys, json, uuid, requests, argparse
+import os, sys, json, uuid, argparse, asyncio
 from pathlib import Path
 
+from _client import from_json, to_json, post_act, aclose
+
 ROOT = Path(__file__).resolve().parents[1]
-GREEN_PORT = int(os.environ.get("GREEN_AGENT_PORT","18080"))
 
-def run_one(domain: str, example_id: str):
+async def run_one(domain: str, example_id: str):
     ex_path = ROOT / "third_party" / "osworld" / "evaluation_examples" / "examples" / domain / f"{example_id}.json"
     if not ex_path.is_file():
         raise SystemExit(f"example not found: {ex_path}")
-    example = json.loads(ex_path.read_text(encoding="utf-8"))
+    example = from_json(ex_path.read_bytes())
     req = {
       "task_id": f"single-{uuid.uuid4()}",
       "instruction": example.get("instruction",""),
@@ -22,14 +23,15 @@ def run_one(domain: str, example_id: str):
         "task_config": example
       }
     }
-    url = f"http://127.0.0.1:{GREEN_PORT}/act"
-    r = requests.post(url, json=req, timeout=900)
-    r.raise_for_status()
-    print(json.dumps(r.json(), indent=2, ensure_ascii=False))
+    try:
+        resp = await post_act(req)
+        sys.stdout.buffer.write(to_json(resp, indent=True) + b"\n")
+    finally:
+        await aclose()
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
     ap.add_argument("--domain", required=True)
     ap.add_argument("--example_id", required=True)
     args = ap.parse_args()
-    run_one(args.domain, args.example_id)
+    asyncio.run(run_one(args.domain, args.example_id))
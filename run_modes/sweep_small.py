@@ -1,17 +1,23 @@
-import os, sys, json, uuid, requests
+import os, sys, json, uuid, asyncio
 from pathlib import Path
 
+from _client import from_json, to_json, post_act, aclose
+
 ROOT = Path(__file__).resolve().parents[1]
-GREEN_PORT = int(os.environ.get("GREEN_AGENT_PORT","18080"))
+CONCURRENCY = max(1, int(os.environ.get("GREEN_CONCURRENCY","8")))
 
-def run_small():
+async def run_small():
     base = ROOT / "third_party" / "osworld" / "evaluation_examples"
-    small = json.loads((base / "test_small.json").read_text(encoding="utf-8"))
-    for domain, ids in small.items():
-        for exid in ids:
-            p = base / "examples" / domain / f"{exid}.json"
-            if not p.is_file(): continue
-            example = json.loads(p.read_text(encoding="utf-8"))
+    small = from_json((base / "test_small.json").read_bytes())
+    tasks = [(domain, exid, base / "examples" / domain / f"{exid}.json")
+             for domain, ids in small.items() for exid in ids]
+    tasks = [(d, ex, p) for d, ex, p in tasks if p.is_file()]
+
+    sem = asyncio.Semaphore(CONCURRENCY)
+
+    async def _one(domain, exid, p):
+        try:
+            example = from_json(p.read_bytes())
             req = {
               "task_id": f"small-{domain}-{exid}",
               "instruction": example.get("instruction",""),
@@ -25,10 +31,23 @@ def run_small():
                 "task_config": example
               }
             }
-            url = f"http://127.0.0.1:{GREEN_PORT}/act"
-            r = requests.post(url, json=req, timeout=900)
-            r.raise_for_status()
-            print(json.dumps(r.json(), indent=2, ensure_ascii=False))
+            async with sem:
+                resp = await post_act(req)
+            return to_json(resp, indent=True)
+        except Exception as e:
+            print(f"[error] {domain}/{exid}: {e}", file=sys.stderr)
+            return None
+
+    # Fan out over the shared keep-alive client; printing happens here
+    # as results complete, so output lines never interleave.
+    try:
+        for coro in asyncio.as_completed([_one(d, ex, p) for d, ex, p in tasks]):
+            out = await coro
+            if out is not None:
+                sys.stdout.buffer.write(out + b"\n")
+                sys.stdout.buffer.flush()
+    finally:
+        await aclose()
 
 if __name__ == "__main__":
-    run_small()
\ No newline at end of file
+    asyncio.run(run_small())
@@ -33,6 +33,7 @@ export PYTHONPATH="$(pwd)/third_party/osworld:${PYTHONPATH:-}"
 echo "[info] starting green on :$PORT"
 # Start service and write PID (PID file stays stable for stop script)
 nohup uvicorn green.app:app --host 0.0.0.0 --port "$PORT" --workers 1 \
+  --loop uvloop --http httptools \
   > "$LOG_FILE" 2>&1 & echo $! > "logs/green/green.pid"
 
 # Maintain a 'latest' symlink for quick tailing
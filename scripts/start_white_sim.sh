@@ -22,6 +22,7 @@ fi
 
 echo "[info] starting white_sim on :$PORT"
 nohup uvicorn white_sim.server:app --host 0.0.0.0 --port "$PORT" --workers 1 \
+  --loop uvloop --http httptools \
   > "$LOG_FILE" 2>&1 & echo $! > "logs/white/white.pid"
 
 # Maintain a 'latest' symlink for quick tailing
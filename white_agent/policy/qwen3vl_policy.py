@@ -21,6 +21,11 @@ from google.api_core.exceptions import (
 )
 from white_agent.utils.qwen_vl_utils import smart_resize
 
+try:
+    import pybase64 as _b64
+except Exception:  # pragma: no cover - pybase64 is a declared dependency
+    _b64 = base64
+
 
 logger = None
 
@@ -28,13 +33,20 @@ MAX_RETRY_TIMES = 5
 
 
 def encode_image(image_content):
-    return base64.b64encode(image_content).decode("utf-8")
+    # pybase64 decodes/encodes with SIMD kernels; screenshots are
+    # multi-hundred-KB so this is a measurable per-step saving.
+    return _b64.b64encode(image_content).decode("utf-8")
 
 
-def process_image(image_bytes):
+def process_image(image_bytes, source_b64=None):
     """
     Process an image for Qwen VL models (thinking variant).
     Uses a tighter resize cap consistent with the thinking DUN agent.
+
+    Returns (base64_png, width, height) of the processed image. When
+    smart_resize leaves the dimensions unchanged, the original PNG (or
+    its already-base64 wire form, if the caller has one) is reused
+    instead of round-tripping through a PIL re-encode.
     """
     image = Image.open(BytesIO(image_bytes))
     width, height = image.size
@@ -46,13 +58,17 @@ def process_image(image_bytes):
         max_pixels=16 * 16 * 4 * 12800,
     )
 
+    if (resized_width, resized_height) == (width, height):
+        b64 = source_b64 if source_b64 is not None else encode_image(image_bytes)
+        return b64, width, height
+
     image = image.resize((resized_width, resized_height))
 
     buffer = BytesIO()
     image.save(buffer, format="PNG")
     processed_bytes = buffer.getvalue()
 
-    return base64.b64encode(processed_bytes).decode("utf-8")
+    return _b64.b64encode(processed_bytes).decode("utf-8"), resized_width, resized_height
 
 
 class Qwen3VLAgent:
@@ -97,22 +113,37 @@ class Qwen3VLAgent:
         self.responses = []
         self.screenshots = []
 
+        # Backend HTTP setup is done once: the OpenAI client keeps a
+        # connection pool, so constructing it per call would pay a TCP
+        # plus TLS handshake on every step; dashscope configuration is
+        # module-global and the env vars are fixed at process start.
+        self._openai_client = None
+        if api_backend == "dashscope":
+            dashscope.base_http_api_url = os.environ.get(
+                "DASHSCOPE_BASE_URL", "https://dashscope.aliyuncs.com/api/v1"
+            )
+            dashscope.api_key = os.environ.get("DASHSCOPE_API_KEY", "sk-123")
+
     def predict(self, instruction: str, obs: Dict) -> List:
         """
         Predict the next action(s) based on the current observation.
         Returns (response, pyautogui_code).
         """
-        screenshot_bytes = obs["screenshot"]
+        # The server may forward the wire base64 untouched; decode once
+        # here (the resize decision needs pixels either way) and keep the
+        # string around so an unresized frame skips re-encoding.
+        screenshot_b64 = obs.get("screenshot_b64")
+        screenshot_bytes = obs.get("screenshot")
+        if screenshot_bytes is None:
+            screenshot_bytes = _b64.b64decode(screenshot_b64)
 
         image = Image.open(BytesIO(screenshot_bytes))
         width, height = image.size
         print(f"Original screen resolution: {width}x{height}")
 
-        processed_image = process_image(screenshot_bytes)
-        processed_img = Image.open(
-            BytesIO(base64.b64decode(processed_image))
+        processed_image, processed_width, processed_height = process_image(
+            screenshot_bytes, source_b64=screenshot_b64
         )
-        processed_width, processed_height = processed_img.size
         print(
             "Processed image resolution: "
             f"{processed_width}x{processed_height}"
@@ -628,9 +659,11 @@ Previous actions:
 
     def _call_llm_openai(self, messages, model):
         """Call LLM using OpenAI SDK (compatible with OpenAI-compatible endpoints)."""
-        base_url = os.environ.get("OPENAI_BASE_URL", "https://dashscope.aliyuncs.com/compatible-mode/v1")
-        api_key = os.environ.get("OPENAI_API_KEY", "sk-123")
-        client = openai.OpenAI(base_url=base_url, api_key=api_key)
+        if self._openai_client is None:
+            base_url = os.environ.get("OPENAI_BASE_URL", "https://dashscope.aliyuncs.com/compatible-mode/v1")
+            api_key = os.environ.get("OPENAI_API_KEY", "sk-123")
+            self._openai_client = openai.OpenAI(base_url=base_url, api_key=api_key)
+        client = self._openai_client
 
         for attempt in range(1, MAX_RETRY_TIMES + 1):
             logger.info(f"[OpenAI] Generating content with model: {model} (attempt {attempt}/{MAX_RETRY_TIMES})")
@@ -652,10 +685,7 @@ Previous actions:
         return ""
 
     def _call_llm_dashscope(self, messages, model):
-        """Call LLM using DashScope SDK."""
-        dashscope.base_http_api_url = os.environ.get("DASHSCOPE_BASE_URL", "https://dashscope.aliyuncs.com/api/v1")
-        dashscope.api_key = os.environ.get("DASHSCOPE_API_KEY", "sk-123")
-
+        """Call LLM using DashScope SDK (endpoint/key configured in __init__)."""
         # Convert message schema
         ds_messages = self._to_dashscope_messages(messages)
 
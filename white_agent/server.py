@@ -1,16 +1,51 @@
 from __future__ import annotations
 
-import base64
+import asyncio
+import json
 import logging
 import os
+import re
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional, List
 
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+else:  # pragma: no cover - orjson is a declared dependency
+    _DefaultResponse = JSONResponse
+
+
+def _json_bytes(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 from white_agent.policy.qwen3vl_policy import Qwen3VLAgent
 
-app = FastAPI(title="White Agent (Qwen3VL)")
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Construct the policy at startup instead of lazily on the first
+    # /act: the first user-facing request no longer pays model init,
+    # and two concurrent first requests can no longer race to build
+    # duplicate agents.
+    _ensure_agent()
+    yield
+
+
+app = FastAPI(
+    title="White Agent (Qwen3VL)",
+    default_response_class=_DefaultResponse,
+    lifespan=_lifespan,
+)
 
 logging.basicConfig(level=os.getenv("WHITE_LOG_LEVEL", "INFO"))
 logger = logging.getLogger("white_agent")
@@ -68,66 +103,132 @@ def _ensure_agent() -> Qwen3VLAgent:
     return _agent
 
 
-def _codes_to_action(codes: List[str]) -> Dict[str, Any]:
-    up = [(c or "").strip().upper() for c in (codes or []) if isinstance(c, str)]
+# Pauses are fixed for the process lifetime; resolving them per action
+# re-read os.environ and re-parsed the float on every call, including
+# the DONE/FAIL/WAIT fast paths. The special actions are constant dicts
+# the response encoder only reads, so one instance each suffices.
+_WAIT_PAUSE = float(os.getenv("WHITE_WAIT_PAUSE", "0.8"))
+_ACTION_PAUSE = float(os.getenv("WHITE_ACTION_PAUSE", "0.5"))
+_WAIT_ACTION = {"type": "special", "name": "WAIT", "pause": _WAIT_PAUSE}
+_DONE_ACTION = {"type": "special", "name": "DONE", "pause": 0.0}
+_FAIL_ACTION = {"type": "special", "name": "FAIL", "pause": 0.0}
 
-    # Priority: DONE/FAIL > WAIT > code
-    if "DONE" in up:
-        return {"type": "special", "name": "DONE", "pause": 0.0}
-    if "FAIL" in up:
-        return {"type": "special", "name": "FAIL", "pause": 0.0}
-    if (not up) or ("WAIT" in up):
-        return {
-            "type": "special",
-            "name": "WAIT",
-            "pause": float(os.getenv("WHITE_WAIT_PAUSE", "0.8")),
-        }
-
-    lines = [c for c in (codes or []) if isinstance(c, str) and c.strip() and c.strip().upper() not in ("WAIT", "DONE", "FAIL")]
-    if not lines:
-        return {
-            "type": "special",
-            "name": "WAIT",
-            "pause": float(os.getenv("WHITE_WAIT_PAUSE", "0.8")),
-        }
-
-    pause = float(os.getenv("WHITE_ACTION_PAUSE", "0.5"))
-    # DesktopEnv expects a python snippet. Keep it robust.
-    code = "import pyautogui; " + "; ".join(lines)
-    return {"type": "code", "code": code, "pause": pause}
+# Serialized once for the /act fallback branches, which otherwise ran
+# the full codes-to-action scan plus a JSON encode to emit a constant.
+_WAIT_BYTES = _json_bytes(_WAIT_ACTION)
+
+
+def _wait_response() -> Response:
+    # Fresh Response per call (same pattern as the cached card bytes);
+    # sharing one instance would let any future middleware accumulate
+    # header mutations across requests.
+    return Response(content=_WAIT_BYTES, media_type="application/json")
+
+
+_PYAUTOGUI_PREFIX = "import pyautogui"
 
 
+def _codes_to_action(codes: List[str]) -> Dict[str, Any]:
+    # Single pass: flag the special markers and collect code lines as we
+    # go, instead of building an uppercased copy, scanning it three
+    # times, and then re-filtering the original list.
+    has_done = has_fail = has_wait = False
+    lines: List[str] = []
+    for c in codes or ():
+        if not isinstance(c, str):
+            continue
+        s = c.strip()
+        if not s:
+            continue
+        u = s.upper()
+        if u == "DONE":
+            has_done = True
+        elif u == "FAIL":
+            has_fail = True
+        elif u == "WAIT":
+            has_wait = True
+        else:
+            lines.append(s)
+
+    # Priority: DONE/FAIL > WAIT > code
+    if has_done:
+        return _DONE_ACTION
+    if has_fail:
+        return _FAIL_ACTION
+    if has_wait or not lines:
+        return _WAIT_ACTION
+
+    # DesktopEnv expects a python snippet. Keep it robust. Seeding the
+    # join with the import prefix builds the snippet in one allocation
+    # instead of a join followed by a concatenation.
+    return {"type": "code", "code": "; ".join((_PYAUTOGUI_PREFIX, *lines)), "pause": _ACTION_PAUSE}
+
+
+# Both cards depend only on env vars fixed at process start (the
+# controller injects AGENT_URL before launch), so serialize them once;
+# the polled handlers below then just hand back cached bytes.
+_AGENT_CARD_BYTES = _json_bytes(_build_agent_card())
+_CARD_BYTES = _json_bytes({
+    "name": "white-qwen3vl",
+    "version": "0.1.0",
+    "backend": os.getenv("OSWORLD_API_BACKEND", "dashscope"),
+    "model": os.getenv("OSWORLD_VL_MODEL", "qwen3-vl"),
+})
+
+
+# async handlers: sync `def` endpoints get dispatched to the anyio
+# threadpool, a pointless round-trip for handlers that build a dict.
+# AgentBeats polls the probe endpoints frequently.
 @app.get("/health")
-def health():
+async def health():
     return {"ok": True}
 
 
 @app.get("/.well-known/agent-card.json")
-def well_known_agent_card():
-    return _build_agent_card()
+async def well_known_agent_card():
+    return Response(content=_AGENT_CARD_BYTES, media_type="application/json")
 
 
 @app.get("/card")
-def card():
+async def card():
     # legacy lightweight info for local debugging
-    return {
-        "name": "white-qwen3vl",
-        "version": "0.1.0",
-        "backend": os.getenv("OSWORLD_API_BACKEND", "dashscope"),
-        "model": os.getenv("OSWORLD_VL_MODEL", "qwen3-vl"),
-    }
+    return Response(content=_CARD_BYTES, media_type="application/json")
 
 
 @app.post("/reset")
-def reset():
+async def reset():
     agent = _ensure_agent()
     agent.reset(logger)
     return {"reset": "ok"}
 
 
+# Strict base64 alphabet, optional trailing padding. Green encodes
+# screenshots without line wrapping, so whitespace never appears in a
+# well-formed payload and rejecting it here is fine.
+_B64_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}\Z")
+
+# The policy is one mutable conversation (actions/responses/screenshots
+# lists feed the next prompt), so concurrent predict calls would
+# corrupt its history. Default of 1 serializes /act; raising
+# WHITE_MAX_INFLIGHT is only safe once the agent is re-entrant.
+_ACT_SEM = asyncio.Semaphore(int(os.getenv("WHITE_MAX_INFLIGHT", "1")))
+
+
 @app.post("/act")
-def act(payload: dict):
-    agent = _ensure_agent()
+async def act(request: Request):
+    # Warm since startup (see _lifespan); no per-request init branch.
+    agent = _agent
+
+    # Decode the body ourselves: the `payload: dict` signature routed
+    # the multi-hundred-KB screenshot payload through stdlib json plus
+    # FastAPI's body validation, both pure overhead for a free-form
+    # dict. orjson parses the same bytes several times faster.
+    try:
+        payload = _json_loads(await request.body())
+    except Exception:
+        payload = None
+    if not isinstance(payload, dict):
+        return _wait_response()
 
     instruction = (payload.get("instruction") or "").strip()
     obs = payload.get("observation") or {}
@@ -137,18 +238,28 @@ def act(payload: dict):
 
     # If no instruction or no screenshot, safest fallback is WAIT (won't crash)
     if not instruction or not b64:
-        return JSONResponse(content=_codes_to_action(["WAIT"]))
+        return _wait_response()
 
-    try:
-        screenshot = base64.b64decode(b64)
-    except Exception as e:
-        logger.warning(f"[white] bad screenshot_b64 decode: {e}")
-        return JSONResponse(content=_codes_to_action(["WAIT"]))
+    # Garbage payloads otherwise travel to the worker thread and fail
+    # inside the decoder, paying thread dispatch plus exception
+    # construction; this length/alphabet check costs one C-level scan.
+    if isinstance(b64, str) and (len(b64) & 3 or not _B64_RE.fullmatch(b64)):
+        logger.warning("[white] rejecting malformed screenshot base64")
+        return _wait_response()
 
     try:
-        # Qwen3VLAgent expects {"screenshot": <bytes>}
-        _resp, codes = agent.predict(instruction, {"screenshot": screenshot})
-        return JSONResponse(content=_codes_to_action(codes))
+        # Forward the wire base64 untouched: the policy decodes it once
+        # for its resize decision and reuses the string for the data URL
+        # when no resize is needed, so decoding here would only add a
+        # second pass over a multi-hundred-KB payload. A malformed
+        # string raises inside predict and lands in the WAIT fallback.
+        # predict blocks on the VL backend, so hop to a worker thread to
+        # keep the event loop free for health/card probes meanwhile.
+        async with _ACT_SEM:
+            _resp, codes = await asyncio.to_thread(
+                agent.predict, instruction, {"screenshot_b64": b64}
+            )
+        return _DefaultResponse(content=_codes_to_action(codes))
     except Exception as e:
         logger.exception(f"[white] policy predict error: {e}")
-        return JSONResponse(content=_codes_to_action(["WAIT"]))
+        return _wait_response()
@@ -1,13 +1,31 @@
 # white_sim/server.py
 from __future__ import annotations
 
+import json
 import os
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-app = FastAPI(title="White Agent Baseline")
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
-# Counter for the toy baseline policy
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as _DefaultResponse
+else:  # pragma: no cover - orjson is a declared dependency
+    _DefaultResponse = JSONResponse
+
+
+def _json_bytes(obj) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode("utf-8")
+
+app = FastAPI(title="White Agent Baseline", default_response_class=_DefaultResponse)
+
+# Legacy counter for callers that do not send a step index. It is
+# process-wide, so concurrent rollouts that rely on it desynchronize;
+# green sends `step` in the payload and never touches this.
 _calls = 0
 
 
@@ -58,31 +76,53 @@ def _build_agent_card() -> dict:
     }
 
 
+# Both cards depend only on env vars fixed at process start (the
+# controller injects AGENT_URL before launch), so serialize them once;
+# the polled handlers below then just hand back cached bytes.
+_AGENT_CARD_BYTES = _json_bytes(_build_agent_card())
+_CARD_BYTES = _json_bytes({
+    "name": "white-baseline",
+    "version": "0.0.1",
+    "policy": "baseline-scroll-then-wait",
+})
+
+# The baseline emits one of exactly four fixed actions, so the JSON
+# bodies are serialized once here and /act just picks cached bytes.
+_ACT_STEPS = (
+    _json_bytes({"type": "special", "name": "WAIT", "pause": 0.8}),
+    _json_bytes({
+        "type": "code",
+        "code": "import pyautogui; pyautogui.scroll(-400)",
+        "pause": 0.5,
+    }),
+    _json_bytes({"type": "special", "name": "WAIT", "pause": 0.5}),
+)
+_ACT_DONE = _json_bytes({"type": "special", "name": "DONE", "pause": 0.0})
+
+
+# async handlers: sync `def` endpoints get dispatched to the anyio
+# threadpool, a pointless round-trip for handlers this trivial.
 @app.get("/.well-known/agent-card.json")
-def well_known_agent_card():
+async def well_known_agent_card():
     """
     AgentBeats queries this endpoint to discover and describe the white agent.
     """
-    return _build_agent_card()
+    return Response(content=_AGENT_CARD_BYTES, media_type="application/json")
 
 
 # ---------------- A2A INTERFACE: keep the legacy endpoints /card /reset /act -----------------
 
 
 @app.get("/card")
-def card():
+async def card():
     """
     Legacy lightweight card used by locally run green agents or runner.py.
     """
-    return {
-        "name": "white-baseline",
-        "version": "0.0.1",
-        "policy": "baseline-scroll-then-wait",
-    }
+    return Response(content=_CARD_BYTES, media_type="application/json")
 
 
 @app.post("/reset")
-def reset():
+async def reset():
     """
     Reset internal state before each new interaction round.
     """
@@ -92,7 +132,7 @@ def reset():
 
 
 @app.post("/act")
-def act(payload: dict):
+async def act(payload: dict):
     """
     Minimal baseline policy:
 
@@ -104,30 +144,18 @@ def act(payload: dict):
     The green agent will repeatedly call this endpoint,
     passing OSWorld observations in `payload`, but this baseline
     ignores the observation and simply follows the fixed schedule above.
-    """
-    global _calls
-    _calls += 1
-
-    if _calls == 1:
-        return JSONResponse(
-            content={"type": "special", "name": "WAIT", "pause": 0.8}
-        )
-
-    if _calls == 2:
-        return JSONResponse(
-            content={
-                "type": "code",
-                "code": "import pyautogui; pyautogui.scroll(-400)",
-                "pause": 0.5,
-            }
-        )
-
-    if _calls == 3:
-        return JSONResponse(
-            content={"type": "special", "name": "WAIT", "pause": 0.5}
-        )
 
-    # Step 4 and onward — signal completion
-    return JSONResponse(
-        content={"type": "special", "name": "DONE", "pause": 0.0}
-    )
\ No newline at end of file
+    Green includes the 1-based `step` index of its rollout loop, which
+    keys the schedule without any server-side state — concurrent
+    rollouts each see their own step sequence, and the handler scales
+    across uvicorn workers. The shared counter survives only as a
+    fallback for hand-rolled callers that omit `step`.
+    """
+    step = payload.get("step")
+    if not isinstance(step, int) or step < 1:
+        global _calls
+        _calls += 1
+        step = _calls
+
+    body = _ACT_STEPS[step - 1] if step <= 3 else _ACT_DONE
+    return Response(content=body, media_type="application/json")
\ No newline at end of file